@@ -0,0 +1,225 @@
+#!/usr/bin/env python3
+
+
+import hashlib
+import json
+import statistics
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from pathlib import Path
+
+import click
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import write_period
+
+import main
+
+BASELINE_FILE: Path = Path(__file__).with_name("baseline.json")
+
+# All star lineups are always picked from reports this long, whatever sizes are being timed
+LINEUP_ROWS: int = 2000
+HONORABLE_MENTIONS: int = 10
+
+# Parsing and lineup solving against generated pages, timed without going near CBS
+Case = tuple[str, Callable[[], list[str]]]
+
+
+def sizes(value: str) -> list[int]:
+    return [int(size) for size in value.split(",")]
+
+
+@click.command()
+@click.option("--rows", type=sizes, default="1,100,1000,10000", show_default=True)
+@click.option("--teams", type=sizes, default="30,120,480", show_default=True)
+@click.option(
+    "--depth",
+    type=sizes,
+    default="10,50,200",
+    show_default=True,
+    help="How many candidates per position the all star lineup is chosen from",
+)
+@click.option(
+    "--parser",
+    type=click.Choice(main.HTML_PARSERS),
+    default=main.DEFAULT_HTML_PARSER,
+    show_default=True,
+)
+@click.option("--repeat", type=click.IntRange(min=1), default=5, show_default=True)
+@click.option(
+    "--tolerance",
+    type=float,
+    default=0.5,
+    show_default=True,
+    help="How much slower than the baseline a case may get before it counts as a regression",
+)
+@click.option("--update-baseline", is_flag=True, help="Store these results as the new baseline")
+def bench(
+    rows: list[int],
+    teams: list[int],
+    depth: list[int],
+    parser: str,
+    repeat: int,
+    tolerance: float,
+    update_baseline: bool,
+) -> None:
+    try:
+        baselines = json.loads(BASELINE_FILE.read_text())
+    except FileNotFoundError:
+        baselines = {}
+    baseline = baselines.setdefault(parser, {})
+
+    regressions = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, run in cases(Path(cache_dir), rows, teams, depth, parser):
+            seconds, digest = measure(run, repeat)
+            line = f"{name}: {seconds * 1000:.2f}ms"
+
+            if name in baseline and digest != baseline[name]["digest"]:
+                line += " CHANGED OUTPUT"
+                regressions.append(name)
+            elif name in baseline:
+                change = seconds / baseline[name]["seconds"] - 1
+                line += f" ({change:+.0%})"
+                # Sub-millisecond cases jitter by more than any tolerance worth setting
+                if change > tolerance and seconds - baseline[name]["seconds"] > 0.001:
+                    line += " SLOWER"
+                    regressions.append(name)
+
+            click.echo(line)
+            if update_baseline:
+                baseline[name] = {"seconds": seconds, "digest": digest}
+
+    if update_baseline:
+        BASELINE_FILE.write_text(json.dumps(baselines, indent=2, sort_keys=True) + "\n")
+    elif regressions:
+        raise click.ClickException(f"{len(regressions)} regressed: {', '.join(regressions)}")
+
+
+def measure(run: Callable[[], list[str]], repeat: int) -> tuple[float, str]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lines = run()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), hashlib.sha256("\n".join(lines).encode()).hexdigest()
+
+
+def cases(
+    cache_dir: Path, rows: list[int], teams: list[int], depth: list[int], parser: str
+) -> list[Case]:
+    cases: list[Case] = []
+
+    # Each league size and each report size gets its own scoring period in the cache
+    for count in teams:
+        write_period(cache_dir, count, count, 300)
+        cache = main.PageCache(cache_dir, count, offline=True)
+        league = main.parse_matchups(main.RD2_LEAGUE, cache, count, parser)
+        cases += [
+            (
+                f"load_team[teams={count}]",
+                lambda cache=cache, count=count: team_lines(
+                    main.parse_matchups(main.RD2_LEAGUE, cache, count, parser)
+                ),
+            ),
+            (
+                f"ranked_scorers[teams={count}]",
+                lambda league=league: [
+                    *main.top_scorers(league),
+                    *main.top_scorers(league, False),
+                    *main.top_scorers(league, points=lambda team: team.hitting_points),
+                ],
+            ),
+            (
+                f"division_table[teams={count}]",
+                lambda league=league: main.division_table(league, main.RD2_LEAGUE.divisions),
+            ),
+        ]
+
+    for count in rows:
+        scoring_period = 100000 + count
+        write_period(cache_dir, scoring_period, 30, count)
+        cache = main.PageCache(cache_dir, scoring_period, offline=True)
+        page_source = cache.read(
+            main.stats_report_url(main.RD2_LEAGUE.home, scoring_period, "SP:RP")
+        )
+        table = main.parse_stats_table(main.RD2_LEAGUE, cache, scoring_period, parser)
+        table.assign_teams(main.parse_matchups(main.RD2_LEAGUE, cache, scoring_period, parser))
+        cases += [
+            (
+                f"stats_rows[rows={count}]",
+                lambda page_source=page_source: [
+                    repr(row) for row in main.stats_rows(page_source, parser, pitchers=True)
+                ],
+            ),
+            (
+                f"point_leaders[rows={count}]",
+                lambda table=table: leader_lines(
+                    main.parse_point_leaders(table, main.RD2_LEAGUE.all_star_positions)
+                ),
+            ),
+        ]
+
+    write_period(cache_dir, 0, 30, LINEUP_ROWS)
+    cache = main.PageCache(cache_dir, 0, offline=True)
+    table = main.parse_stats_table(main.RD2_LEAGUE, cache, 0, parser)
+    table.assign_teams(main.parse_matchups(main.RD2_LEAGUE, cache, 0, parser))
+    for count in depth:
+        cases += [
+            (
+                f"all_star_lineup[depth={count}]",
+                lambda count=count: main.all_star_lineup(
+                    candidates(table, count), main.RD2_LEAGUE.all_star_positions
+                ),
+            ),
+            (
+                f"honorable_mentions[depth={count}]",
+                lambda count=count: [
+                    *main.all_star_lineup(
+                        candidates(table, count),
+                        main.RD2_LEAGUE.all_star_positions,
+                        replacements=True,
+                    ),
+                    *main.honorable_mentions_table(
+                        candidates(table, count),
+                        main.RD2_LEAGUE.all_star_positions,
+                        HONORABLE_MENTIONS,
+                    ),
+                ],
+            ),
+        ]
+
+    return cases
+
+
+def candidates(table: main.StatsTable, depth: int) -> list[main.PointLeaders]:
+    boards = []
+    for position in main.RD2_LEAGUE.all_star_positions:
+        board = main.PointLeaders(position, depth, True)
+        for player in table.top(position, depth, True):
+            board.add(player)
+        boards.append(board)
+    return boards
+
+
+def team_lines(teams: list[main.Team]) -> list[str]:
+    return [
+        f"{team.name} {team.hitting_points:.1f} {team.pitching_points:.1f}"
+        f" {len(team.players)} {team.wins} {team.losses} {team.ties}"
+        for team in teams
+    ]
+
+
+def leader_lines(leaders: list[main.PointLeaders]) -> list[str]:
+    return [
+        f"{board.position} {board.descending} {player.id} {player.points} {player.team}"
+        for board in leaders
+        for player in board.players
+    ]
+
+
+if __name__ == "__main__":
+    bench()
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+
+
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+import click
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+from fixtures import write_period
+from standin import League, StandIn
+
+import main
+
+
+def docker_host() -> str:
+    # Firefox runs in a container and the stats reports are fetched from here, so the stand-in
+    # has to be reached at an address both ends can see: the Docker bridge's gateway
+    return subprocess.check_output(
+        ["docker", "network", "inspect", "bridge", "-f", "{{(index .IPAM.Config 0).Gateway}}"],
+        text=True,
+    ).strip()
+
+
+@click.command()
+@click.option("--periods", type=click.IntRange(min=1), default=3, show_default=True)
+@click.option("--teams", type=click.IntRange(min=2), default=30, show_default=True)
+@click.option("--rows", type=click.IntRange(min=1), default=1000, show_default=True)
+@click.option(
+    "--snapshots",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    help="Serve these captured pages instead of generated ones",
+)
+@click.option("--host", help="Address the stand-in is reached at  [default: the Docker gateway]")
+@click.option("--port", type=int, default=8000, show_default=True)
+@click.option("--sessions", type=click.IntRange(min=1), default=1, show_default=True)
+@click.option("--concurrency", type=click.IntRange(min=1), default=4, show_default=True)
+@click.option("--parser", type=click.Choice(main.HTML_PARSERS), default=main.DEFAULT_HTML_PARSER)
+@click.option("--lean/--no-lean", default=True, show_default=True)
+@click.option(
+    "--profile",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also write the stage timings as JSON and a Prometheus textfile",
+)
+def e2e(
+    periods: int,
+    teams: int,
+    rows: int,
+    snapshots: Path | None,
+    host: str | None,
+    port: int,
+    sessions: int,
+    concurrency: int,
+    parser: str,
+    lean: bool,
+    profile: Path | None,
+) -> None:
+    with tempfile.TemporaryDirectory() as fixtures_dir, tempfile.TemporaryDirectory() as cache_dir:
+        if snapshots:
+            served = snapshots
+            scoring_periods = sorted(
+                int(manifest.parent.name) for manifest in snapshots.glob("*/manifest.json")
+            )
+        else:
+            served = Path(fixtures_dir)
+            scoring_periods = list(range(1, periods + 1))
+            for scoring_period in scoring_periods:
+                write_period(served, scoring_period, teams, rows, seed=scoring_period)
+
+        league = replace(main.RD2_LEAGUE, home=f"http://{host or docker_host()}:{port}")
+        main.PROFILER.enabled = True
+        with (
+            main.profiling(profile),
+            StandIn(League(served), "0.0.0.0", port),
+            main.logged_in_browsers(
+                league, "standin", "standin", sessions, lean, False
+            ) as browsers,
+        ):
+            client = main.StatsClient(browsers[0], concurrency)
+            start = time.perf_counter()
+            for scoring_period in scoring_periods:
+                main.summary_markdown(
+                    league,
+                    *main.scrape_period(
+                        league, browsers, client, scoring_period, Path(cache_dir), parser
+                    ),
+                )
+            seconds = time.perf_counter() - start
+
+    fetches = [record for record in main.PROFILER.records if record["stage"] == "fetch"]
+    size = sum(record["bytes"] for record in fetches)
+    click.echo(
+        f"{len(scoring_periods)} periods, {len(fetches)} pages and {size / 2**20:.1f} MiB"
+        f" in {seconds:.2f}s: {len(fetches) / seconds:.1f} pages/s,"
+        f" {seconds / len(scoring_periods):.2f}s per period"
+    )
+    for total in main.PROFILER.totals():
+        labels = " ".join(
+            str(value)
+            for key, value in total.items()
+            if key not in ("count", "seconds", "bytes", "rows")
+        )
+        click.echo(f"  {labels}: {total['seconds']:.2f}s over {total['count']}")
+
+
+if __name__ == "__main__":
+    e2e()
@@ -0,0 +1,117 @@
+import random
+from pathlib import Path
+
+import main
+
+ROSTER_SIZE: int = 25
+ACTIVE_PLAYERS: int = 20
+ROSTER_POSITIONS: list[str] = ["C", "1B", "2B", "3B", "SS", "OF", "OF", "OF", "U", "SP", "SP", "RP"]
+
+
+def team_names(count: int) -> list[str]:
+    # Leagues bigger than the real one get made up teams, shared out between the divisions
+    names = list(main.RD2_LEAGUE.divisions)[:count]
+    divisions = sorted(set(main.RD2_LEAGUE.divisions.values()))
+    for index in range(len(names), count):
+        name = f"Team {index + 1}"
+        main.RD2_LEAGUE.divisions[name] = divisions[index % len(divisions)]
+        names.append(name)
+    return names
+
+
+def player_id(team: int, slot: int) -> int:
+    return 100000 + team * 100 + slot
+
+
+def points(rng: random.Random) -> float:
+    # A long tail keeps the leaders spread out, as they are on CBS, rather than piled up on a
+    # few tied scores that every all star lineup would have to enumerate
+    return round(rng.gammavariate(2, 5) - 5, 2)
+
+
+def scoreboard_page(matchups: int) -> str:
+    tables = "".join(
+        f'<table id="matchup_hilite_{index}"><tr><td>Matchup</td></tr></table>'
+        for index in range(matchups)
+    )
+    return f"<html><body>{tables}</body></html>"
+
+
+def roster(rng: random.Random, home_or_away: str, name: str, team: int) -> str:
+    rows = []
+    for slot in range(ROSTER_SIZE):
+        active = slot < ACTIVE_PLAYERS
+        position = ROSTER_POSITIONS[slot % len(ROSTER_POSITIONS)]
+        score = (
+            f'<a class="scoreLink" id="score_total_active_{slot}">{points(rng)}</a>'
+            if active
+            else ""
+        )
+        rows.append(
+            f'<tr><td id="player_{"active" if active else "reserve"}_{team}_{slot}"></td>'
+            f'<td><a class="playerLink" href="/players/playerpage/{player_id(team, slot)}"'
+            f' title="Player {player_id(team, slot)} {position} NYY">Player</a>'
+            f"<div>{position} | NYY</div></td><td>{score}</td></tr>"
+        )
+    return (
+        f'<div><span id="{home_or_away}_big_name"> {name} </span></div>'
+        f'<div id="{home_or_away}_team_roster"><table>{"".join(rows)}</table></div>'
+    )
+
+
+def matchup_page(rng: random.Random, names: list[str], home: int, away: int) -> str:
+    return (
+        f"<html><body>{roster(rng, 'home', names[home], home)}"
+        f"{roster(rng, 'away', names[away], away)}</body></html>"
+    )
+
+
+def stats_report_page(
+    rng: random.Random, season: dict[int, float], rows: int, pitchers: bool
+) -> str:
+    players = sorted(
+        ((season[player], player) for player in rng.sample(list(season), rows)),
+        key=lambda row: -row[0],
+    )
+    body = []
+    for player_points, player in players:
+        games = rng.randint(1, 3)
+        body.append(
+            f'<tr valign="top"><td><a class="playerLink" href="/players/playerpage/{player}"'
+            f' aria-label="Player {player} SP NYY">Player {player}</a></td>'
+            f'<td align="right">NYY</td><td align="right">{games}</td>'
+            f'<td align="right">{rng.randint(0, games) if pitchers else 0}</td>'
+            f'<td class="bold">{player_points}</td></tr>'
+        )
+    return f"<html><body><table><tbody>{''.join(body)}</tbody></table></body></html>"
+
+
+def write_period(
+    cache_dir: Path, scoring_period: int, teams: int, rows: int, seed: int = 0
+) -> list[str]:
+    rng = random.Random(seed)
+    names = team_names(teams)
+    order = rng.sample(range(teams), teams)
+    pairs = list(zip(order[::2], order[1::2], strict=False))
+
+    cache = main.PageCache(cache_dir, scoring_period, offline=False)
+    url = main.scoreboard_url(main.RD2_LEAGUE.home, scoring_period)
+    cache.page_source(url, "scoreboard", lambda: scoreboard_page(len(pairs)))
+    for index, (home, away) in enumerate(pairs):
+        page = matchup_page(rng, names, home, away)
+        cache.page_source(url, "matchup", lambda page=page: page, f"matchup_hilite_{index}")
+
+    # Rostered players and free agents alike turn up in several reports, as they do on CBS
+    pool = [player_id(team, slot) for team in range(teams) for slot in range(ROSTER_SIZE)]
+    pool += range(900000, 900000 + max(rows, len(pool)))
+    season = {player: points(rng) for player in pool}
+    for position in main.RD2_LEAGUE.stats_report_positions:
+        page = stats_report_page(rng, season, rows, "P" in position)
+        cache.page_source(
+            main.stats_report_url(main.RD2_LEAGUE.home, scoring_period, position),
+            "stats_report",
+            lambda page=page: page,
+        )
+
+    cache.commit()
+    return names
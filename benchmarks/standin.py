@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+
+
+import gzip
+import json
+import secrets
+import sys
+import threading
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import parse_qs, urlsplit
+
+import click
+from bs4 import BeautifulSoup  # type: ignore
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import main
+
+SESSION_COOKIE: str = "standin_session"
+
+LOGIN_PAGE: str = """<html><body>
+<form method="post" action="/login">
+<input name="email" type="text"><input name="password" type="password">
+<button type="submit">Log In</button>
+</form>
+</body></html>"""
+
+# Matchups are swapped in when their table is clicked, as they are on CBS, so the page source
+# only ever holds the matchup that was clicked last
+SCOREBOARD_PAGE: str = """<html><body>
+{tables}
+<div id="matchup"></div>
+<script>
+const MATCHUPS = {matchups};
+for (const table of document.querySelectorAll("table[id^='matchup_hilite_']")) {{
+    table.addEventListener("click", () => {{
+        document.getElementById("matchup").innerHTML = MATCHUPS[table.id];
+    }});
+}}
+</script>
+</body></html>"""
+
+
+class League:
+    def __init__(self, cache_dir: Path) -> None:
+        # Pages are served from snapshots, whether captured from CBS or generated, and are
+        # looked up by path so that they are found whatever host they were captured from
+        self.scoreboards: dict[str, str] = {}
+        self.pages: dict[str, str] = {}
+        for manifest_file in sorted(cache_dir.glob("*/manifest.json")):
+            matchups: dict[str, str] = {}
+            scoreboard = None
+            scoreboard_source = ""
+            for key, page in json.loads(manifest_file.read_text())["pages"].items():
+                source = gzip.decompress((manifest_file.parent / f"{key}.html.gz").read_bytes())
+                url = urlsplit(page["url"])
+                path = f"{url.path}?{url.query}" if url.query else url.path
+                if page["matchup_id"]:
+                    soup = BeautifulSoup(source, "html.parser", parse_only=main.MATCHUP_SCOPE)
+                    matchups[page["matchup_id"]] = str(soup)
+                elif "/scoring/completed/" in path:
+                    scoreboard, scoreboard_source = path, source.decode()
+                else:
+                    self.pages[path] = source.decode()
+
+            if scoreboard:
+                order = main.matchup_ids(scoreboard_source, "html.parser")
+                self.scoreboards[scoreboard] = self.scoreboard_page(
+                    {matchup_id: matchups[matchup_id] for matchup_id in order}
+                )
+
+    @staticmethod
+    def scoreboard_page(matchups: dict[str, str]) -> str:
+        tables = "\n".join(
+            f'<table id="{matchup_id}"><tr><td>{matchup_id}</td></tr></table>'
+            for matchup_id in matchups
+        )
+        return SCOREBOARD_PAGE.format(
+            tables=tables, matchups=json.dumps(matchups).replace("</", "<\\/")
+        )
+
+
+class StandIn(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, league: League, host: str, port: int) -> None:
+        super().__init__((host, port), Handler)
+        self.league = league
+        self.sessions: set[str] = set()
+        self.lock = threading.Lock()
+
+    def __enter__(self) -> "StandIn":
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.shutdown()
+        self.server_close()
+
+
+class Handler(BaseHTTPRequestHandler):
+    server: StandIn
+
+    def log_message(self, format: str, *args: object) -> None:
+        pass
+
+    def do_GET(self) -> None:
+        if self.path == "/login":
+            return self.send_page(LOGIN_PAGE)
+        if not self.logged_in():
+            return self.redirect("/login")
+        if self.path == "/":
+            return self.send_page("<html><body>Reddit Dynasty 2</body></html>")
+
+        path = self.path.rstrip("/")
+        page = self.server.league.scoreboards.get(path) or self.server.league.pages.get(path)
+        if page is None:
+            return self.send_error(HTTPStatus.NOT_FOUND)
+        self.send_page(page)
+
+    def do_POST(self) -> None:
+        form = parse_qs(self.rfile.read(int(self.headers["Content-Length"] or 0)).decode())
+        if self.path != "/login" or not form.get("email") or not form.get("password"):
+            return self.redirect("/login")
+
+        session = secrets.token_hex(16)
+        with self.server.lock:
+            self.server.sessions.add(session)
+        self.redirect("/", f"{SESSION_COOKIE}={session}; Path=/")
+
+    def logged_in(self) -> bool:
+        cookies = dict(
+            cookie.strip().split("=", 1)
+            for cookie in (self.headers["Cookie"] or "").split(";")
+            if "=" in cookie
+        )
+        return cookies.get(SESSION_COOKIE) in self.server.sessions
+
+    def redirect(self, location: str, cookie: str | None = None) -> None:
+        self.send_response(HTTPStatus.FOUND)
+        self.send_header("Location", location)
+        if cookie:
+            self.send_header("Set-Cookie", cookie)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def send_page(self, page: str) -> None:
+        body = page.encode()
+        self.send_response(HTTPStatus.OK)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@click.command()
+@click.option(
+    "--cache-dir",
+    type=click.Path(exists=True, file_okay=False, path_type=Path),
+    default=Path(".cache/pages"),
+    show_default=True,
+    help="Snapshots of the pages to serve",
+)
+@click.option("--host", default="0.0.0.0", show_default=True)
+@click.option("--port", type=int, default=8000, show_default=True)
+def serve(cache_dir: Path, host: str, port: int) -> None:
+    StandIn(League(cache_dir), host, port).serve_forever()
+
+
+if __name__ == "__main__":
+    serve()
@@ -1,28 +1,282 @@
 #!/usr/bin/env python3
 
 
-import itertools
+import csv
+import gzip
+import hashlib
+import heapq
+import importlib.util
+import json
+import math
+import multiprocessing
 import operator
+import os
+import queue
 import re
+import shutil
+import sqlite3
 import statistics
 import subprocess
-from collections import OrderedDict, defaultdict
-from collections.abc import Callable, Iterable
+import threading
+import time
+import tomllib
+from collections import OrderedDict, defaultdict, deque
+from collections.abc import Callable, Iterable, Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
+from contextlib import ExitStack, contextmanager, suppress
 from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
 from enum import Enum
-from itertools import groupby, product
+from functools import cache, partial
+from itertools import groupby, islice
+from pathlib import Path
 from types import TracebackType
-from typing import TypeVar
+from typing import NamedTuple, TypeVar
+from urllib.parse import quote
 
 import click
-from bs4 import BeautifulSoup, Tag  # type: ignore
+import numpy as np
+import urllib3
+from bs4 import BeautifulSoup, SoupStrainer, Tag  # type: ignore
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from selenium.webdriver import Remote
 from selenium.webdriver.common.by import By
 from selenium.webdriver.firefox.options import Options
-from selenium.webdriver.support import expected_conditions as expect
 from selenium.webdriver.support.wait import WebDriverWait
 
-LEAGUE_HOME: str = "https://reddit2.baseball.cbssports.com"
+# Pointing this somewhere else, such as the stand-in server in benchmarks, scrapes that instead
+LEAGUE_HOME: str = os.environ.get("RD2WEEKLY_LEAGUE_HOME", "https://reddit2.baseball.cbssports.com")
+
+# Scores in a period that is still being played keep changing, so a snapshot of one is only worth
+# replaying for a short while
+IN_PROGRESS_TTL: timedelta = timedelta(hours=1)
+
+# Keep-warm runs leave Selenium up between runs and reuse the CBS login while it lasts
+SELENIUM_ENDPOINT_FILE: Path = Path(".cache/selenium-endpoint")
+SESSION_TTL: timedelta = timedelta(hours=12)
+
+# Lean scraping keeps Firefox from loading anything that never shows up in the page source
+BLOCKED_HOSTS: list[str] = [
+    "2mdn.net",
+    "adnxs.com",
+    "adsafeprotected.com",
+    "amazon-adsystem.com",
+    "chartbeat.com",
+    "chartbeat.net",
+    "criteo.com",
+    "demdex.net",
+    "doubleclick.net",
+    "facebook.net",
+    "google-analytics.com",
+    "googlesyndication.com",
+    "googletagmanager.com",
+    "googletagservices.com",
+    "krxd.net",
+    "moatads.com",
+    "omtrdc.net",
+    "outbrain.com",
+    "pubmatic.com",
+    "quantserve.com",
+    "rubiconproject.com",
+    "scorecardresearch.com",
+    "taboola.com",
+]
+PAGE_WEIGHT_SCRIPT: str = """
+return performance.getEntries()
+    .filter(entry => "transferSize" in entry && entry.startTime >= arguments[0])
+    .reduce((total, entry) => total + entry.transferSize, 0);
+"""
+
+# Each step waits on the page being ready rather than for a fixed time. Steps start out as
+# patient as CBS has ever needed and then settle at a few times their slowest recent wait, so a
+# stalled page is retried long before a fixed timeout would give up. Each try is more patient
+# than the last, and the last is as patient as the first ever was, so a page that is only slow
+# is still waited for
+WAIT_MAX: float = 30
+WAIT_MIN: float = 2
+WAIT_MARGIN: float = 4
+WAIT_HISTORY: int = 20
+WAIT_RETRIES: int = 2
+WAIT_BACKOFF: float = 0.5
+WAIT_POLL: float = 0.05
+
+# The page being left is marked before the next one is asked for, so that a load that is only
+# slow can be waited on rather than started over. The next page is ready once it has replaced
+# the marked one and has been built, or has loaded in full unless the profile is lean
+PAGE_LEAVING_SCRIPT: str = """
+window.rd2weeklyLeaving = true;
+"""
+PAGE_LOADED_SCRIPT: str = """
+if (window.rd2weeklyLeaving) return false;
+return document.readyState === "complete"
+    || (arguments[0] === "eager" && document.readyState === "interactive");
+"""
+LOGIN_FORM_SCRIPT: str = """
+return document.readyState !== "loading" && !!document.querySelector("input[name=email]");
+"""
+LOGGED_IN_SCRIPT: str = """
+return location.href.startsWith(arguments[0])
+    && !location.pathname.startsWith("/login")
+    && document.readyState !== "loading";
+"""
+# The rosters on show are marked before the next matchup is clicked, and that one is ready once
+# both have been swapped out. A matchup that is already on show, whether it was read last or is
+# the one the scoreboard opened on, is read as it is, since clicking it again may not redraw it.
+# The marks are properties of the elements rather than attributes so that they never end up in
+# the saved page source
+MATCHUP_SHOWN_SCRIPT: str = """
+const rosters = ["#home_team_roster", "#away_team_roster"].map(id => document.querySelector(id));
+if (!rosters.every(roster => roster)) return [performance.now(), false];
+const table = document.getElementById(arguments[0]);
+const names = ["#home_big_name", "#away_big_name"]
+    .map(id => document.querySelector(id))
+    .map(name => name ? name.textContent.trim() : "");
+const shown = rosters[0].rd2weeklyMatchup === undefined
+    ? !!table && names.every(name => name && table.textContent.includes(name))
+    : rosters[0].rd2weeklyMatchup === arguments[0];
+if (!shown) rosters.forEach(roster => roster.rd2weeklyShown = true);
+return [performance.now(), shown];
+"""
+# Only the team names and rosters are read from a matchup, so once it is ready they are all
+# that is sent back and saved, rather than the whole page
+MATCHUP_SOURCE_SCRIPT: str = """
+const roster = document.querySelector("#home_team_roster");
+const name = document.querySelector("#home_big_name");
+const away = document.querySelector("#away_team_roster");
+if (!roster || !name || !away || roster.rd2weeklyShown || away.rd2weeklyShown) return null;
+roster.rd2weeklyMatchup = arguments[0];
+const fragments = ["home_big_name", "home_team_roster", "away_big_name", "away_team_roster"]
+    .map(id => document.getElementById(id))
+    .filter(element => element)
+    .map(element => element.outerHTML);
+return `<html><body>${fragments.join("")}</body></html>`;
+"""
+
+# Profiled runs export their stage timings for Prometheus under this prefix
+METRICS_PREFIX: str = "rd2weekly"
+
+# Every period summarised is kept here too, with running totals for the season so far
+SEASON_SCHEMA: str = """
+CREATE TABLE IF NOT EXISTS team_periods (
+    scoring_period INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    division TEXT NOT NULL,
+    hitting_points REAL NOT NULL,
+    pitching_points REAL NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    outside_wins INTEGER NOT NULL,
+    outside_losses INTEGER NOT NULL,
+    outside_ties INTEGER NOT NULL,
+    PRIMARY KEY (scoring_period, team)
+);
+CREATE INDEX IF NOT EXISTS team_periods_team ON team_periods (team);
+
+CREATE TABLE IF NOT EXISTS matchup_periods (
+    scoring_period INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    opponent TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS matchup_periods_period ON matchup_periods (scoring_period);
+
+CREATE TABLE IF NOT EXISTS player_periods (
+    scoring_period INTEGER NOT NULL,
+    team TEXT NOT NULL,
+    player_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    active_points REAL NOT NULL,
+    active_batter INTEGER NOT NULL,
+    active_pitcher INTEGER NOT NULL,
+    PRIMARY KEY (scoring_period, team, player_id)
+);
+CREATE INDEX IF NOT EXISTS player_periods_player ON player_periods (player_id);
+
+CREATE TABLE IF NOT EXISTS leader_periods (
+    scoring_period INTEGER NOT NULL,
+    position TEXT NOT NULL,
+    descending INTEGER NOT NULL,
+    player_id INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    team TEXT,
+    points REAL NOT NULL,
+    PRIMARY KEY (scoring_period, position, descending, player_id)
+);
+CREATE INDEX IF NOT EXISTS leader_periods_player ON leader_periods (player_id);
+
+CREATE TABLE IF NOT EXISTS team_seasons (
+    team TEXT PRIMARY KEY,
+    division TEXT NOT NULL,
+    periods INTEGER NOT NULL,
+    hitting_points REAL NOT NULL,
+    pitching_points REAL NOT NULL,
+    wins INTEGER NOT NULL,
+    losses INTEGER NOT NULL,
+    ties INTEGER NOT NULL,
+    outside_wins INTEGER NOT NULL,
+    outside_losses INTEGER NOT NULL,
+    outside_ties INTEGER NOT NULL,
+    best_points REAL,
+    best_period INTEGER
+);
+
+CREATE TABLE IF NOT EXISTS player_seasons (
+    player_id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    active_periods INTEGER NOT NULL,
+    active_points REAL NOT NULL
+);
+"""
+SEASON_TEAM_TOTALS: list[str] = [
+    "hitting_points",
+    "pitching_points",
+    "wins",
+    "losses",
+    "ties",
+    "outside_wins",
+    "outside_losses",
+    "outside_ties",
+]
+
+# Parsed periods are saved in this format so summaries can be rendered again without scraping;
+# the version changes whenever the layout does
+SNAPSHOT_VERSION: int = 1
+SNAPSHOT_SUFFIXES: list[str] = [".json", ".msgpack"]
+
+# Playoff odds are simulated in batches of this many seasons, each seeded from the run's seed,
+# so a seeded run comes out the same however many workers share out the batches
+SIMULATION_BATCH: int = 10_000
+
+# Pages are parsed as they come in while the next ones load; once this many are waiting, the
+# browsers hold off until the parsers catch up
+PARSE_WORKERS: int = 2
+PARSE_QUEUE_SIZE: int = 8
+
+HTML_PARSERS: list[str] = ["lxml", "html.parser"]
+DEFAULT_HTML_PARSER: str = "lxml" if importlib.util.find_spec("lxml") else "html.parser"
+
+# Only these parts of each page are read, so nothing else is worth building a tree for. Stats
+# reports are scoped on their tables rather than on a tbody, which only the browser's DOM is
+# sure to have
+SCOREBOARD_SCOPE = SoupStrainer("table", id=re.compile(r"^matchup_hilite_"))
+MATCHUP_SCOPE = SoupStrainer(id=re.compile(r"^(home|away)_(big_name|team_roster)$"))
+STATS_REPORT_SCOPE = SoupStrainer("table")
+# Watching a period compares only what is read from each page from poll to poll: the team names,
+# roster slots, player links, positions and scores of a matchup, and the rows of a stats report
+MATCHUP_READ = re.compile(
+    r"""\bid="(?:(?:home|away)_big_name|player_(?:active|reserve)_\d+_\d+)"[^>]*>[^<]*"""
+    r"""|<a\b[^>]*\bclass="[^"]*\b(?:playerLink|scoreLink)\b[^>]*>[^<]*</a>(?:\s*<div>[^<]*)?"""
+)
+STATS_REPORT_READ = re.compile(
+    r"""<tr\b[^>]*\bvalign=["']?top\b.*?</tr>""", re.DOTALL | re.IGNORECASE
+)
 
 DIVISIONS: dict[str, str] = {
     # AL East
@@ -72,6 +326,10 @@ ALL_STAR_POSITIONS: dict[str, int] = {
     "U": 2,
 }
 
+# Every lineup tied for the best total is an all star lineup, but a big enough tie, say among
+# scoreless bench players, would list more than anyone reads, so only the first few are
+MAX_ALL_STAR_LINEUPS: int = 10
+
 NICKNAMES: dict[int, str] = {
     530362: "Kate Upton",
     1232129: "Big Dick Rick",
@@ -84,6 +342,76 @@ NICKNAMES: dict[int, str] = {
     2210421: 'Willians "La Tortuga" Astudillo',
 }
 
+# Pitchers are ranked by role from the one report they all share, rather than by position
+PITCHING_LEADERS: list[tuple[str, bool]] = [
+    ("2SP", True),
+    ("1SP", True),
+    ("RP", True),
+    ("SP", False),
+    ("RP", False),
+]
+
+
+# Whatever tells one league apart from another is handed to the code that reads it, so that
+# several leagues can be summarised side by side
+@dataclass(frozen=True)
+class LeagueSettings:
+    home: str
+    divisions: dict[str, str]
+    all_star_positions: dict[str, int]
+    nicknames: dict[int, str]
+    # Where the login and page weights are kept from run to run
+    state_dir: Path
+
+    @property
+    def stats_report_positions(self) -> list[str]:
+        return [*self.all_star_positions, "SP:RP"]
+
+    @property
+    def session_file(self) -> Path:
+        return self.state_dir / "session.json"
+
+    @property
+    def page_weights_file(self) -> Path:
+        return self.state_dir / "page-weights.json"
+
+
+# The league summarised by every command but leagues
+RD2_LEAGUE: LeagueSettings = LeagueSettings(
+    home=LEAGUE_HOME,
+    divisions=DIVISIONS,
+    all_star_positions=ALL_STAR_POSITIONS,
+    nicknames=NICKNAMES,
+    state_dir=Path(".cache"),
+)
+
+
+# Settings that a league in a --config file can have
+LEAGUE_SETTINGS: set[str] = {
+    "home",
+    "username",
+    "password",
+    "sessions",
+    "divisions",
+    "all_star_positions",
+    "nicknames",
+    "cache_dir",
+    "output_dir",
+    "store",
+}
+
+
+@dataclass
+class League:
+    name: str
+    settings: LeagueSettings
+    username: str | None
+    password: str | None
+    sessions: int
+    cache_dir: Path
+    output_dir: Path
+    store: Path
+
 
 @dataclass(frozen=True)
 class RosteredPlayer:
@@ -131,24 +459,372 @@ class ScoringPlayer:
     team: str = field(init=False)
 
 
+class StatsRow(NamedTuple):
+    id: int
+    name: str
+    points: float
+    games: int | None
+    games_started: int | None
+
+
+class Leaderboard[S]:
+    def __init__(
+        self, size: int, descending: bool, points: Callable[[S], float], by_group: bool
+    ) -> None:
+        # Keeps the best `size` distinct scores when ranking by group, otherwise the best `size`
+        # entries plus anything tied with the last of them
+        self.size = size
+        self.descending = descending
+        self.points = points
+        self.by_group = by_group
+        self.count = 0
+        self.groups: dict[float, list[S]] = {}
+        self.worst: list[float] = []
+
+    def rank_key(self, points: float) -> float:
+        return points if self.descending else -points
+
+    def full(self) -> bool:
+        return (len(self.groups) if self.by_group else self.count) >= self.size
+
+    def add(self, entry: S) -> bool:
+        points = self.points(entry)
+        if points in self.groups:
+            self.groups[points].append(entry)
+        elif self.full() and (not self.worst or self.rank_key(points) < self.worst[0]):
+            return False
+        else:
+            heapq.heappush(self.worst, self.rank_key(points))
+            self.groups[points] = [entry]
+        self.count += 1
+
+        # Joining a group can push the worst group out as surely as starting one can
+        while self.worst:
+            worst_group = self.groups[self.rank_key(self.worst[0])]
+            if self.by_group:
+                if len(self.groups) <= self.size:
+                    break
+            elif self.count - len(worst_group) < self.size:
+                break
+
+            del self.groups[self.rank_key(heapq.heappop(self.worst))]
+            self.count -= len(worst_group)
+
+        return points in self.groups
+
+    def ranked(self) -> list[tuple[float, list[S]]]:
+        return sorted(self.groups.items(), key=lambda group: group[0], reverse=self.descending)
+
+
 @dataclass
 class PointLeaders:
     position: str
     max_scorers: int
     descending: bool
-    players: list[ScoringPlayer] = field(default_factory=list, init=False)
+    leaderboard: Leaderboard[ScoringPlayer] = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.clear()
+
+    def clear(self) -> None:
+        self.leaderboard = Leaderboard(
+            self.max_scorers, self.descending, operator.attrgetter("points"), by_group=False
+        )
+
+    @property
+    def players(self) -> list[ScoringPlayer]:
+        return [player for _, group in self.leaderboard.ranked() for player in group]
 
     def add(self, player: ScoringPlayer) -> bool:
-        if len(self.players) < self.max_scorers:
-            self.players.append(player)
-            return True
+        return self.leaderboard.add(player)
 
-        compare = operator.ge if self.descending else operator.le
-        if compare(player.points, self.players[-1].points):
-            self.players.append(player)
-            return True
 
-        return False
+class StatsTable:
+    def __init__(self, reports: dict[str, list[StatsRow]]) -> None:
+        # One row per player per stats report, stored column by column; names, positions and
+        # teams are stored as indexes into lists of the distinct values
+        self.positions = list(reports)
+        rows = [
+            (code, row) for code, position in enumerate(self.positions) for row in reports[position]
+        ]
+        size = len(rows)
+
+        self.name_codes: dict[str, int] = {}
+        self.position = np.fromiter((code for code, _ in rows), np.int16, size)
+        self.id = np.fromiter((row.id for _, row in rows), np.int64, size)
+        self.name = np.fromiter(
+            (self.name_codes.setdefault(row.name, len(self.name_codes)) for _, row in rows),
+            np.int32,
+            size,
+        )
+        self.points = np.fromiter((row.points for _, row in rows), np.float64, size)
+        self.games = np.fromiter(
+            (-1 if row.games is None else row.games for _, row in rows), np.int32, size
+        )
+        self.games_started = np.fromiter(
+            (-1 if row.games_started is None else row.games_started for _, row in rows),
+            np.int32,
+            size,
+        )
+        self.names = list(self.name_codes)
+
+        self.teams: list[str] = []
+        self.rostered = np.array([], np.int64)
+        self.owners = np.array([], np.int32)
+        self.team = np.full(size, -1, np.int32)
+
+    def assign_teams(self, teams: list[Team]) -> None:
+        self.teams = [team.name for team in teams]
+        rostered = np.array([player.id for team in teams for player in team.players], np.int64)
+        owners = np.array([code for code, team in enumerate(teams) for _ in team.players], np.int32)
+        order = np.argsort(rostered, kind="stable")
+        self.rostered = rostered[order]
+        self.owners = owners[order]
+        self.team = self.owner(self.id)
+
+    def owner(self, ids: np.ndarray) -> np.ndarray:
+        if not len(self.rostered):
+            return np.full(len(ids), -1, np.int32)
+        slots = np.minimum(np.searchsorted(self.rostered, ids), len(self.rostered) - 1)
+        return np.where(self.rostered[slots] == ids, self.owners[slots], -1).astype(np.int32)
+
+    def update(self, position: str, rows: list[StatsRow]) -> set[int]:
+        # Rows that changed are written over where the report lists its players in the same
+        # order as before. Otherwise the report's rows are swapped for the new ones, since ties
+        # are broken by the order they are listed in. Either way the players whose rows changed,
+        # came or went are handed back
+        code = self.positions.index(position)
+        current = np.flatnonzero(self.position == code)
+        size = len(rows)
+        ids = np.fromiter((row.id for row in rows), np.int64, size)
+        name = np.fromiter(
+            (self.name_codes.setdefault(row.name, len(self.name_codes)) for row in rows),
+            np.int32,
+            size,
+        )
+        self.names = list(self.name_codes)
+        points = np.fromiter((row.points for row in rows), np.float64, size)
+        games = np.fromiter(
+            (-1 if row.games is None else row.games for row in rows), np.int32, size
+        )
+        games_started = np.fromiter(
+            (-1 if row.games_started is None else row.games_started for row in rows),
+            np.int32,
+            size,
+        )
+
+        if len(current) == size and np.array_equal(self.id[current], ids):
+            changed = (
+                (self.name[current] != name)
+                | (self.points[current] != points)
+                | (self.games[current] != games)
+                | (self.games_started[current] != games_started)
+            )
+            rewritten = current[changed]
+            self.name[rewritten] = name[changed]
+            self.points[rewritten] = points[changed]
+            self.games[rewritten] = games[changed]
+            self.games_started[rewritten] = games_started[changed]
+            return set(ids[changed].tolist())
+
+        def values(ids: np.ndarray, *columns: np.ndarray) -> dict[int, tuple[int | float, ...]]:
+            rows = zip(*(column.tolist() for column in columns), strict=True)
+            return dict(zip(ids.tolist(), rows, strict=True))
+
+        before = values(
+            self.id[current],
+            self.name[current],
+            self.points[current],
+            self.games[current],
+            self.games_started[current],
+        )
+        after = values(ids, name, points, games, games_started)
+
+        # Players listed in a new order among those they tie with are handed back too
+        def ties(ids: np.ndarray, points: np.ndarray) -> dict[float, list[int]]:
+            groups: dict[float, list[int]] = defaultdict(list)
+            for player, score in zip(ids.tolist(), points.tolist(), strict=True):
+                groups[score].append(player)
+            return groups
+
+        ties_before = ties(self.id[current], self.points[current])
+        ties_after = ties(ids, points)
+        reordered = {
+            player
+            for score in ties_before.keys() | ties_after.keys()
+            if ties_before.get(score) != ties_after.get(score)
+            for player in (*ties_before.get(score, ()), *ties_after.get(score, ()))
+        }
+
+        kept = self.position != code
+        self.position = np.concatenate((self.position[kept], np.full(size, code, np.int16)))
+        self.id = np.concatenate((self.id[kept], ids))
+        self.name = np.concatenate((self.name[kept], name))
+        self.points = np.concatenate((self.points[kept], points))
+        self.games = np.concatenate((self.games[kept], games))
+        self.games_started = np.concatenate((self.games_started[kept], games_started))
+        self.team = np.concatenate((self.team[kept], self.owner(ids)))
+        return reordered | {
+            player
+            for player in before.keys() | after.keys()
+            if before.get(player) != after.get(player)
+        }
+
+    def pitching(self, role: str) -> np.ndarray:
+        pitched = self.games > 0
+        return {
+            "2SP": pitched & (self.games_started >= 2),
+            "1SP": pitched & (self.games_started == 1),
+            "SP": pitched & (self.games_started > 0),
+            "RP": pitched & (self.games_started == 0),
+        }[role]
+
+    def top(
+        self,
+        position: str,
+        count: int,
+        descending: bool,
+        where: np.ndarray | None = None,
+    ) -> list[ScoringPlayer]:
+        mask = self.position == self.positions.index(position)
+        if where is not None:
+            mask &= where
+
+        # CBS lists the best scorers first, and ties keep the order they are met in when the
+        # report is read from the relevant end
+        rows = np.flatnonzero(mask)
+        if not descending:
+            rows = rows[::-1]
+        points = self.points[rows]
+        rows = rows[np.argsort(-points if descending else points, kind="stable")]
+
+        if len(rows) > count:
+            cutoff = self.points[rows[count - 1]]
+            rows = rows[: count + np.count_nonzero(self.points[rows[count:]] == cutoff)]
+
+        return [self.player(row) for row in rows]
+
+    def player(self, row: int) -> ScoringPlayer:
+        player = ScoringPlayer(
+            self.names[self.name[row]], int(self.id[row]), float(self.points[row])
+        )
+        player.team = self.teams[self.team[row]] if self.team[row] >= 0 else "FA"
+        return player
+
+
+class Schedule:
+    def __init__(self, teams: list[str], points: np.ndarray, games: np.ndarray) -> None:
+        # Points are periods by teams, NaN where a team has no score, and games counts how often
+        # each pair of teams met in each period
+        self.teams = teams
+        self.points = points
+        self.games = games
+        size = len(teams)
+
+        # Every team against every other team in every period at once, played or not
+        beat = points[:, :, None] > points[:, None, :]
+        lost = points[:, :, None] < points[:, None, :]
+        tied = points[:, :, None] == points[:, None, :]
+        tied[:, np.arange(size), np.arange(size)] = False
+        self.beat, self.lost, self.tied = beat, lost, tied
+
+        self.all_play_wins = beat.sum(axis=(0, 2))
+        self.all_play_losses = lost.sum(axis=(0, 2))
+        self.all_play_ties = tied.sum(axis=(0, 2))
+
+        opponents = beat.sum(axis=2) + lost.sum(axis=2) + tied.sum(axis=2)
+        share = np.divide(
+            beat.sum(axis=2) + tied.sum(axis=2) / 2,
+            opponents,
+            out=np.zeros(opponents.shape),
+            where=opponents > 0,
+        )
+        played = games.sum(axis=2)
+        self.played = played.sum(axis=0)
+        self.expected_wins = (share * played).sum(axis=0)
+
+        self.wins, self.losses, self.ties = self.records()
+        self.luck = self.wins + self.ties / 2 - self.expected_wins
+
+        # How many points a team's opponents scored against it, and how they fared against
+        # the whole league over every period
+        faced = np.einsum("pij,pj->i", games, np.nan_to_num(points))
+        self.opponent_points = np.divide(
+            faced, self.played, out=np.zeros(size), where=self.played > 0
+        )
+        all_play_games = self.all_play_wins + self.all_play_losses + self.all_play_ties
+        self.all_play_share = np.divide(
+            self.all_play_wins + self.all_play_ties / 2,
+            all_play_games,
+            out=np.zeros(size),
+            where=all_play_games > 0,
+        )
+        self.schedule_strength = np.divide(
+            np.einsum("pij,j->i", games, self.all_play_share),
+            self.played,
+            out=np.zeros(size),
+            where=self.played > 0,
+        )
+
+    def records(self) -> tuple[np.ndarray, ...]:
+        return tuple(
+            (self.games * outcome).sum(axis=(0, 2)) for outcome in (self.beat, self.lost, self.tied)
+        )
+
+
+@dataclass
+class PlayoffRace:
+    # Teams' standings and points so far, how their weekly scores are spread, and the matchups
+    # left to play as indexes into the teams and the periods left
+    teams: list[str]
+    divisions: np.ndarray
+    standings: np.ndarray
+    points: np.ndarray
+    mean: np.ndarray
+    spread: np.ndarray
+    period: np.ndarray
+    home: np.ndarray
+    away: np.ndarray
+    playoff_teams: int
+
+    def simulate(self, seed: np.random.SeedSequence, seasons: int) -> tuple[np.ndarray, ...]:
+        # Every season, period and team at once: seasons x periods x teams weekly scores, each
+        # team's drawn from a normal distribution fitted to the weeks it has played
+        rng = np.random.default_rng(seed)
+        size = len(self.teams)
+        periods = int(self.period.max()) + 1 if len(self.period) else 0
+        scores = rng.normal(self.mean, self.spread, (seasons, periods, size))
+
+        home = scores[:, self.period, self.home]
+        away = scores[:, self.period, self.away]
+        won = (home > away) + (home == away) / 2
+        home_games = np.zeros((len(self.home), size))
+        home_games[np.arange(len(self.home)), self.home] = 1
+        away_games = np.zeros((len(self.away), size))
+        away_games[np.arange(len(self.away)), self.away] = 1
+        standings = self.standings + won @ home_games + (1 - won) @ away_games
+
+        playing = np.zeros((periods, size), bool)
+        playing[self.period, self.home] = True
+        playing[self.period, self.away] = True
+        points = self.points + (scores * playing).sum(axis=1)
+
+        # Records come first and points only break ties, as in the season standings
+        order = standings * 1e7 + points
+        seasons_index = np.arange(seasons)
+        won_division = np.zeros((seasons, size), bool)
+        for division in np.unique(self.divisions):
+            contenders = np.where(self.divisions == division, order, -np.inf)
+            won_division[seasons_index, contenders.argmax(axis=1)] = True
+
+        made_playoffs = won_division.copy()
+        wild_cards = self.playoff_teams - int(won_division[0].sum())
+        if wild_cards > 0:
+            rest = np.where(won_division, -np.inf, order)
+            picked = np.argpartition(-rest, wild_cards - 1, axis=1)[:, :wild_cards]
+            made_playoffs[seasons_index[:, None], picked] = True
+
+        return won_division.sum(axis=0), made_playoffs.sum(axis=0)
 
 
 MatchupMode = Enum("MatchupMode", "BLOWOUT CLOSEST STRONGEST_LOSS WEAKEST_WIN LUCKIEST UNLUCKIEST")
@@ -170,16 +846,53 @@ class Matchup:
     def points(self) -> float:
         return self.team1.points - self.team2.points
 
-    def with_mode(self, mode: MatchupMode) -> "Matchup":
-        if mode == MatchupMode.LUCKIEST:
-            return Matchup(self.team1, self.team1, self.teams, mode)
-        elif mode == MatchupMode.UNLUCKIEST:
-            return Matchup(self.team2, self.team2, self.teams, mode)
-        else:
-            return Matchup(self.team1, self.team2, self.teams, mode)
 
-    def __hash__(self) -> int:
-        return hash((self.team1.name, self.team2.name))
+class MatchupSuperlatives:
+    def __init__(self, teams: list[Team]) -> None:
+        # Every superlative keeps its best score so far and the matchups tied on it, all found
+        # in one pass over the week's matchups; the luckiest and unluckiest are single teams
+        self.teams = {team.name: team for team in teams}
+        self.winners: dict[MatchupMode, tuple[float, list[tuple[Team, Team]]]] = {}
+
+        seen = set()
+        for team in teams:
+            for opponent in team.opponents:
+                team1, team2 = sorted((team, self.teams[opponent]), reverse=True)
+                if (team1.name, team2.name) in seen:
+                    continue
+                seen.add((team1.name, team2.name))
+
+                margin = team1.points - team2.points
+                self.consider(MatchupMode.BLOWOUT, margin, True, (team1, team2))
+                self.consider(MatchupMode.CLOSEST, margin, False, (team1, team2))
+                if margin > 0:
+                    self.consider(MatchupMode.STRONGEST_LOSS, team2.points, True, (team1, team2))
+                    self.consider(MatchupMode.WEAKEST_WIN, team1.points, False, (team1, team2))
+                if not team1.losses:
+                    self.consider(MatchupMode.LUCKIEST, team1.points, False, (team1, team1))
+                if not team2.wins:
+                    self.consider(MatchupMode.UNLUCKIEST, team2.points, True, (team2, team2))
+
+    def consider(
+        self, mode: MatchupMode, points: float, descending: bool, pair: tuple[Team, Team]
+    ) -> None:
+        best = self.winners.get(mode)
+        if best is None or (points > best[0] if descending else points < best[0]):
+            self.winners[mode] = (points, [pair])
+        elif points == best[0] and not any(
+            pair[0] is team1 and pair[1] is team2 for team1, team2 in best[1]
+        ):
+            best[1].append(pair)
+
+    def lines(self, mode: MatchupMode) -> list[str]:
+        if mode not in self.winners:
+            return []
+        points, pairs = self.winners[mode]
+        return top_scorers(
+            [Matchup(team1, team2, self.teams, mode) for team1, team2 in pairs],
+            num_scorers=1,
+            points=lambda _: points,
+        )
 
 
 class MarkdownType(Enum):
@@ -188,202 +901,2010 @@ class MarkdownType(Enum):
 
 
 class WebDriver:
-    def __init__(self):
-        self.driver: Callable[[], str] = lambda: subprocess.check_output(
-            "docker compose port selenium 4444", shell=True, text=True
-        ).strip()
+    def __init__(self, sessions: int = 1, keep_warm: bool = False):
+        self.sessions = sessions
+        self.keep_warm = keep_warm
+        self.endpoint: str | None = None
+
+    def driver(self) -> str:
+        if not self.endpoint:
+            self.endpoint = subprocess.check_output(
+                "docker compose port selenium 4444", shell=True, text=True
+            ).strip()
+        return self.endpoint
 
     def __enter__(self) -> "WebDriver":
-        subprocess.run("docker compose up --wait", check=True, shell=True)
+        if self.keep_warm and (endpoint := self.warm_endpoint()):
+            self.endpoint = endpoint
+            return self
+
+        with PROFILER.stage("selenium_start"):
+            subprocess.run(
+                "docker compose up --wait",
+                check=True,
+                shell=True,
+                env={**os.environ, "SELENIUM_SESSIONS": str(self.sessions)},
+            )
+        if self.keep_warm:
+            SELENIUM_ENDPOINT_FILE.parent.mkdir(parents=True, exist_ok=True)
+            SELENIUM_ENDPOINT_FILE.write_text(self.driver())
         return self
 
+    def warm_endpoint(self) -> str | None:
+        try:
+            endpoint = SELENIUM_ENDPOINT_FILE.read_text().strip()
+            response = urllib3.request("GET", f"http://{endpoint}/status", timeout=2, retries=False)
+            status = json.loads(response.data)["value"]
+        except (FileNotFoundError, urllib3.exceptions.HTTPError, ValueError, KeyError):
+            return None
+
+        # A container started for fewer sessions is brought up again with room for more
+        slots = sum(len(node.get("slots", [])) for node in status.get("nodes", []))
+        if not status.get("ready") or slots < self.sessions:
+            return None
+        return endpoint
+
     def __exit__(
         self,
         type_: type[BaseException] | None,
         value: BaseException | None,
         traceback: TracebackType | None,
     ) -> None:
-        subprocess.check_output("docker compose down", shell=True)
+        if not self.keep_warm:
+            subprocess.check_output("docker compose down", shell=True)
         if value:
             raise value
 
 
-@click.command()
-@click.option("-s", "--scoring-period", type=int, required=True)
-@click.option("-u", "--username", type=str, prompt="Your CBS username")
-@click.option("-p", "--password", type=str, prompt="Your CBS password")
-def generate_summary(scoring_period: int, username: str, password: str) -> None:
-    with WebDriver() as driver:
-        driver_options = Options()
-        driver_options.add_argument("--headless=new")
-        with Remote(options=driver_options, command_executor=driver.driver()) as browser:
-            login(browser, username, password)
+class PageWeights:
+    def __init__(self, lean: bool, path: Path) -> None:
+        self.profile = "lean" if lean else "full"
+        self.path = path
+        self.samples: dict[str, list[tuple[float, int]]] = defaultdict(list)
+        self.lock = threading.Lock()
+
+    def add(self, kind: str, seconds: float, size: int) -> None:
+        with self.lock:
+            self.samples[kind].append((seconds, size))
+
+    def report(self) -> list[str]:
+        try:
+            weights = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            weights = {}
+
+        # Savings are measured against the last run made with the other profile
+        other = weights.get("full" if self.profile == "lean" else "lean", {})
+        current = weights.setdefault(self.profile, {})
+        lines = []
+        for kind, samples in sorted(self.samples.items()):
+            seconds = statistics.mean(sample[0] for sample in samples)
+            size = statistics.mean(sample[1] for sample in samples)
+            current[kind] = {"seconds": seconds, "bytes": size}
+
+            line = f"{kind}: {size / 1024:.0f} KiB in {seconds:.2f}s per page ({self.profile})"
+            if kind in other and self.profile == "lean":
+                line += (
+                    f", saving {(other[kind]['bytes'] - size) / 1024:.0f} KiB"
+                    f" and {other[kind]['seconds'] - seconds:.2f}s"
+                )
+            elif kind in other:
+                line += (
+                    f", {(size - other[kind]['bytes']) / 1024:.0f} KiB"
+                    f" and {seconds - other[kind]['seconds']:.2f}s more than lean"
+                )
+            lines.append(line)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(weights, indent=2))
+        return lines
+
+
+class Waits:
+    def __init__(self) -> None:
+        self.history: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=WAIT_HISTORY))
+        self.lock = threading.Lock()
+
+    def timeout(self, step: str) -> float:
+        with self.lock:
+            history = self.history[step]
+            if not history:
+                return WAIT_MAX
+            return min(WAIT_MAX, max(WAIT_MIN, WAIT_MARGIN * max(history)))
+
+    def add(self, step: str, seconds: float) -> None:
+        with self.lock:
+            self.history[step].append(seconds)
+
+
+def label_value(value: object) -> str:
+    # Label values are quoted in the exposition format, so league names and the like are escaped
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Profiler:
+    def __init__(self) -> None:
+        self.enabled = False
+        self.records: list[dict] = []
+        self.lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str, **labels: str) -> Iterator[dict]:
+        # Callers fill in the bytes and rows they handled; nothing is timed unless profiling
+        record: dict = {"stage": name, **labels}
+        if not self.enabled:
+            yield record
+            return
+
+        start = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["seconds"] = time.perf_counter() - start
+            with self.lock:
+                self.records.append(record)
+
+    def extend(self, records: list[dict]) -> None:
+        with self.lock:
+            self.records.extend(records)
+
+    def totals(self) -> list[dict]:
+        totals: dict[tuple, dict] = {}
+        for record in self.records:
+            labels = {k: v for k, v in record.items() if k not in ("seconds", "bytes", "rows")}
+            total = totals.setdefault(
+                tuple(sorted(labels.items())),
+                {**labels, "count": 0, "seconds": 0.0, "bytes": 0, "rows": 0},
+            )
+            total["count"] += 1
+            total["seconds"] += record["seconds"]
+            total["bytes"] += record.get("bytes", 0)
+            total["rows"] += record.get("rows", 0)
+        return [totals[key] for key in sorted(totals)]
+
+    def write(self, path: Path) -> None:
+        totals = self.totals()
+        report = {
+            "captured_at": datetime.now(UTC).isoformat(),
+            "stages": totals,
+            "records": self.records,
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(report, indent=2))
+
+        # The textfile collector reads the whole file at once, so it is swapped in complete
+        lines = []
+        for metric, help_text in [
+            ("seconds", "Wall time spent in the stage"),
+            ("count", "Times the stage ran"),
+            ("bytes", "Bytes of page source the stage handled"),
+            ("rows", "Rows the stage parsed"),
+        ]:
+            name = f"{METRICS_PREFIX}_stage_{metric}"
+            lines += [f"# HELP {name} {help_text}", f"# TYPE {name} gauge"]
+            for total in totals:
+                labels = ",".join(
+                    f'{key}="{label_value(value)}"'
+                    for key, value in total.items()
+                    if key not in ("count", "seconds", "bytes", "rows")
+                )
+                lines.append(f"{name}{{{labels}}} {total[metric]}")
+        name = f"{METRICS_PREFIX}_run_timestamp_seconds"
+        lines += [
+            f"# HELP {name} When the profiled run finished",
+            f"# TYPE {name} gauge",
+            f"{name} {time.time()}",
+        ]
+
+        textfile = path.with_suffix(".prom")
+        textfile.with_suffix(".prom.partial").write_text("\n".join(lines) + "\n")
+        textfile.with_suffix(".prom.partial").rename(textfile)
+
+
+PROFILER = Profiler()
+
+
+class Browser(Remote):
+    def __init__(self, weights: PageWeights, waits: Waits, **kwargs) -> None:
+        super().__init__(**kwargs)
+        self.weights = weights
+        self.waits = waits
+
+    @staticmethod
+    def options(lean: bool) -> Options:
+        options = Options()
+        options.add_argument("--headless=new")
+        if not lean:
+            return options
+
+        # Everything the scraper reads is in the DOM once it has been built, so there is no need
+        # to wait for the rest of the page, nor to fetch images, media, fonts, ads or trackers
+        options.page_load_strategy = "eager"
+        options.set_preference("permissions.default.image", 2)
+        options.set_preference("media.autoplay.default", 5)
+        options.set_preference("media.autoplay.blocking_policy", 2)
+        options.set_preference("gfx.downloadable_fonts.enabled", False)
+        options.set_preference("browser.display.use_document_fonts", 0)
+
+        proxy_script = (
+            "function FindProxyForURL(url, host) {"
+            f" var blocked = {json.dumps(BLOCKED_HOSTS)};"
+            " for (var i = 0; i < blocked.length; i++) {"
+            "  if (host == blocked[i] || dnsDomainIs(host, '.' + blocked[i])) {"
+            "   return 'PROXY 127.0.0.1:9';"
+            "  }"
+            " }"
+            " return 'DIRECT';"
+            "}"
+        )
+        options.set_preference("network.proxy.type", 2)
+        options.set_preference(
+            "network.proxy.autoconfig_url", f"data:text/javascript,{quote(proxy_script)}"
+        )
+        return options
+
+    def navigate(self, url: str, kind: str) -> None:
+        asked = False
+
+        def load(timeout: float) -> None:
+            nonlocal asked
+            if asked:
+                self.wait_until(
+                    timeout, PAGE_LOADED_SCRIPT, self.capabilities.get("pageLoadStrategy")
+                )
+                return
+            self.execute_script(PAGE_LEAVING_SCRIPT)
+            self.set_page_load_timeout(timeout)
+            asked = True
+            self.get(url)
+
+        start = time.perf_counter()
+        self.attempt(kind, load)
+        self.weights.add(
+            kind, time.perf_counter() - start, self.execute_script(PAGE_WEIGHT_SCRIPT, 0)
+        )
+
+    def matchup_source(self, matchup_id: str) -> str:
+        since, shown = self.execute_script(MATCHUP_SHOWN_SCRIPT, matchup_id)
+
+        def show(timeout: float) -> str:
+            if not shown:
+                self.find_element(By.CSS_SELECTOR, f"table#{matchup_id}").click()
+            return self.wait_until(timeout, MATCHUP_SOURCE_SCRIPT, matchup_id)
+
+        start = time.perf_counter()
+        page_source = self.attempt("matchup", show)
+        self.weights.add(
+            "matchup",
+            time.perf_counter() - start,
+            self.execute_script(PAGE_WEIGHT_SCRIPT, since),
+        )
+        return page_source
 
+    def wait_until(self, timeout: float, script: str, *args: object):
+        # Whatever the script returns once the page is ready is handed back
+        return WebDriverWait(self, timeout, poll_frequency=WAIT_POLL).until(
+            lambda browser: browser.execute_script(script, *args)
+        )
+
+    def attempt[R](self, step: str, action: Callable[[float], R]) -> R:
+        timeout = self.waits.timeout(step)
+        retries = 0
+        start = time.perf_counter()
+        while True:
             try:
-                teams = parse_matchups(browser, scoring_period)
-                leaders = parse_point_leaders(browser, scoring_period)
+                result = action(timeout)
+            except TimeoutException:
+                if retries == WAIT_RETRIES:
+                    raise
+                time.sleep(WAIT_BACKOFF * 2**retries)
+                retries += 1
+                timeout = WAIT_MAX if retries == WAIT_RETRIES else min(WAIT_MAX, timeout * 2)
+            else:
+                # However many tries it took, the whole wait is what the next timeout learns from
+                self.waits.add(step, time.perf_counter() - start)
+                return result
+
+
+class Credentials:
+    def __init__(self, username: str | None, password: str | None) -> None:
+        self.username = username
+        self.password = password
+        self.lock = threading.Lock()
+
+    def get(self) -> tuple[str, str]:
+        # Only ask once, however many browser sessions need to log in
+        with self.lock:
+            self.username = self.username or click.prompt("Your CBS username", type=str)
+            self.password = self.password or click.prompt("Your CBS password", type=str)
+            return self.username, self.password
+
+
+class PageCache:
+    def __init__(self, directory: Path, scoring_period: int, offline: bool) -> None:
+        self.offline = offline
+        self.directory = directory / str(scoring_period)
+        if offline:
+            self.manifest = self.load_manifest()
+        else:
+            # Live runs write a fresh snapshot beside the old one and only replace it once the
+            # whole period has been scraped, so a replay never mixes pages from two runs
+            self.staging = directory / f"{scoring_period}.partial"
+            shutil.rmtree(self.staging, ignore_errors=True)
+            self.staging.mkdir(parents=True)
+            self.manifest = {
+                "scoring_period": scoring_period,
+                "captured_at": datetime.now(UTC).isoformat(),
+                "in_progress": False,
+                "pages": {},
+            }
+
+    def load_manifest(self) -> dict:
+        try:
+            manifest = json.loads((self.directory / "manifest.json").read_text())
+        except FileNotFoundError as ex:
+            raise click.ClickException(
+                f"No snapshot of scoring period {self.directory.name} in {self.directory.parent};"
+                " run once without --offline to capture one"
+            ) from ex
+
+        captured_at = datetime.fromisoformat(manifest["captured_at"])
+        if manifest["in_progress"] and datetime.now(UTC) - captured_at > IN_PROGRESS_TTL:
+            raise click.ClickException(
+                f"Scoring period {self.directory.name} was still in progress when it was"
+                f" captured at {captured_at:%Y-%m-%d %H:%M} UTC; run without --offline to"
+                " capture it again"
+            )
+        return manifest
+
+    @property
+    def in_progress(self) -> bool:
+        return self.manifest["in_progress"]
+
+    @in_progress.setter
+    def in_progress(self, in_progress: bool) -> None:
+        self.manifest["in_progress"] = in_progress
+
+    @staticmethod
+    def has_snapshot(directory: Path, scoring_period: int) -> bool:
+        try:
+            manifest = json.loads((directory / str(scoring_period) / "manifest.json").read_text())
+        except FileNotFoundError:
+            return False
+        return not manifest["in_progress"]
+
+    @staticmethod
+    def key(url: str, matchup_id: str | None) -> str:
+        return hashlib.sha256(f"{url}\0{matchup_id or ''}".encode()).hexdigest()[:32]
+
+    def read(self, url: str, matchup_id: str | None = None) -> str:
+        key = self.key(url, matchup_id)
+        if key not in self.manifest["pages"]:
+            matchup = f" matchup {matchup_id}" if matchup_id else ""
+            raise click.ClickException(
+                f"{url}{matchup} is not in the snapshot of scoring period"
+                f" {self.directory.name}; run without --offline to capture it"
+            )
+        return gzip.decompress((self.directory / f"{key}.html.gz").read_bytes()).decode()
+
+    def page_source(
+        self, url: str, kind: str, load: Callable[[], str], matchup_id: str | None = None
+    ) -> str:
+        if self.offline:
+            return self.read(url, matchup_id)
+
+        key = self.key(url, matchup_id)
+        with PROFILER.stage("fetch", page=kind) as record:
+            page_source = load()
+            record["bytes"] = len(page_source.encode())
+        (self.staging / f"{key}.html.gz").write_bytes(gzip.compress(page_source.encode()))
+        self.manifest["pages"][key] = {"url": url, "matchup_id": matchup_id}
+        return page_source
+
+    def commit(self) -> None:
+        if self.offline:
+            return
+
+        (self.staging / "manifest.json").write_text(json.dumps(self.manifest, indent=2))
+        shutil.rmtree(self.directory, ignore_errors=True)
+        self.staging.rename(self.directory)
+
+
+class SeasonStore:
+    def __init__(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Backfill workers write their periods at the same time, so they wait their turn
+        self.connection = sqlite3.connect(path, timeout=60)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SEASON_SCHEMA)
+
+    def __enter__(self) -> "SeasonStore":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.connection.close()
+
+    def add_period(
+        self,
+        scoring_period: int,
+        teams: list[Team],
+        leaders: list[PointLeaders],
+        divisions: dict[str, str],
+    ) -> None:
+        team_rows = []
+        for team in teams:
+            division = divisions[team.name]
+
+            def outside(opponents: list[str], division: str = division) -> int:
+                return sum(divisions[opponent] != division for opponent in opponents)
+
+            team_rows.append(
+                (
+                    scoring_period,
+                    team.name,
+                    division,
+                    team.hitting_points,
+                    team.pitching_points,
+                    len(team.wins),
+                    len(team.losses),
+                    len(team.ties),
+                    outside(team.wins),
+                    outside(team.losses),
+                    outside(team.ties),
+                )
+            )
+        matchup_rows = [
+            (scoring_period, team.name, opponent) for team in teams for opponent in team.opponents
+        ]
+        player_rows = [
+            (
+                scoring_period,
+                team.name,
+                player.id,
+                player.name,
+                player.active_points,
+                player.active_batter,
+                player.active_pitcher,
+            )
+            for team in teams
+            for player in team.players
+        ]
+        leader_rows = [
+            (
+                scoring_period,
+                board.position,
+                board.descending,
+                player.id,
+                player.name,
+                player.team,
+                player.points,
+            )
+            for board in leaders
+            for player in board.players
+        ]
+
+        # A period summarised again, such as one that was still being played last time, replaces
+        # what was stored for it before, totals included
+        with self.connection:
+            self.remove_period(scoring_period)
+            self.connection.executemany(
+                "INSERT INTO team_periods VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", team_rows
+            )
+            self.connection.executemany(
+                "INSERT INTO matchup_periods VALUES (?, ?, ?)", matchup_rows
+            )
+            self.connection.executemany(
+                "INSERT INTO player_periods VALUES (?, ?, ?, ?, ?, ?, ?)", player_rows
+            )
+            self.connection.executemany(
+                "INSERT INTO leader_periods VALUES (?, ?, ?, ?, ?, ?, ?)", leader_rows
+            )
+
+            totals = ", ".join(
+                f"{column} = {column} + excluded.{column}" for column in SEASON_TEAM_TOTALS
+            )
+            self.connection.execute(
+                f"""
+                INSERT INTO team_seasons
+                SELECT team, division, 1, {", ".join(SEASON_TEAM_TOTALS)},
+                    hitting_points + pitching_points, scoring_period
+                FROM team_periods WHERE scoring_period = ?
+                ON CONFLICT (team) DO UPDATE SET
+                    division = excluded.division,
+                    periods = periods + 1,
+                    {totals},
+                    best_period = CASE WHEN excluded.best_points > best_points
+                        OR (excluded.best_points = best_points
+                            AND excluded.best_period < best_period)
+                        THEN excluded.best_period ELSE best_period END,
+                    best_points = MAX(best_points, excluded.best_points)
+                """,
+                (scoring_period,),
+            )
+            self.connection.execute(
+                """
+                INSERT INTO player_seasons
+                SELECT player_id, name, active_batter OR active_pitcher, active_points
+                FROM player_periods WHERE scoring_period = ?
+                ON CONFLICT (player_id) DO UPDATE SET
+                    name = excluded.name,
+                    active_periods = active_periods + excluded.active_periods,
+                    active_points = active_points + excluded.active_points
+                """,
+                (scoring_period,),
+            )
+
+    def remove_period(self, scoring_period: int) -> None:
+        totals = ", ".join(
+            f"{column} = team_seasons.{column} - period.{column}" for column in SEASON_TEAM_TOTALS
+        )
+        self.connection.execute(
+            f"""
+            UPDATE team_seasons SET periods = periods - 1, {totals}
+            FROM team_periods AS period
+            WHERE period.scoring_period = ? AND period.team = team_seasons.team
+            """,
+            (scoring_period,),
+        )
+        self.connection.execute(
+            """
+            UPDATE player_seasons SET
+                active_periods = player_seasons.active_periods - period.active_periods,
+                active_points = player_seasons.active_points - period.active_points
+            FROM (
+                SELECT player_id, SUM(active_batter OR active_pitcher) AS active_periods,
+                    SUM(active_points) AS active_points
+                FROM player_periods WHERE scoring_period = ? GROUP BY player_id
+            ) AS period
+            WHERE period.player_id = player_seasons.player_id
+            """,
+            (scoring_period,),
+        )
+        for table in ["team_periods", "matchup_periods", "player_periods", "leader_periods"]:
+            self.connection.execute(
+                f"DELETE FROM {table} WHERE scoring_period = ?", (scoring_period,)
+            )
+
+        # Only a team whose best week was this one needs to look through the rest again
+        self.connection.execute(
+            """
+            UPDATE team_seasons SET (best_points, best_period) = (
+                SELECT hitting_points + pitching_points, scoring_period FROM team_periods
+                WHERE team_periods.team = team_seasons.team
+                ORDER BY 1 DESC, 2 LIMIT 1
+            )
+            WHERE best_period = ?
+            """,
+            (scoring_period,),
+        )
+        self.connection.execute("DELETE FROM team_seasons WHERE periods = 0")
+        self.connection.execute(
+            """
+            DELETE FROM player_seasons
+            WHERE player_id NOT IN (SELECT player_id FROM player_periods)
+            """
+        )
+
+    def teams(self) -> list[sqlite3.Row]:
+        return self.connection.execute("SELECT * FROM team_seasons ORDER BY team").fetchall()
+
+    def best_weeks(self, count: int) -> list[sqlite3.Row]:
+        return self.connection.execute(
+            """
+            SELECT team, scoring_period, hitting_points + pitching_points AS points
+            FROM team_periods ORDER BY points DESC, scoring_period LIMIT ?
+            """,
+            (count,),
+        ).fetchall()
+
+    def top_players(self, count: int) -> list[sqlite3.Row]:
+        return self.connection.execute(
+            "SELECT * FROM player_seasons ORDER BY active_points DESC, name LIMIT ?", (count,)
+        ).fetchall()
+
+    def schedule(self) -> Schedule:
+        teams = self.connection.execute(
+            "SELECT scoring_period, team, hitting_points + pitching_points FROM team_periods"
+        ).fetchall()
+        matchups = self.connection.execute(
+            "SELECT scoring_period, team, opponent FROM matchup_periods"
+        ).fetchall()
+
+        periods = {period: code for code, period in enumerate(self.periods())}
+        names = sorted({row[1] for row in teams})
+        codes = {name: code for code, name in enumerate(names)}
+        points = np.full((len(periods), len(names)), np.nan)
+        points[[periods[row[0]] for row in teams], [codes[row[1]] for row in teams]] = [
+            row[2] for row in teams
+        ]
+        games = np.zeros((len(periods), len(names), len(names)), np.int16)
+        np.add.at(
+            games,
+            (
+                np.array([periods[row[0]] for row in matchups], np.intp),
+                np.array([codes[row[1]] for row in matchups], np.intp),
+                np.array([codes[row[2]] for row in matchups], np.intp),
+            ),
+            1,
+        )
+        return Schedule(names, points, games)
+
+    def periods(self) -> list[int]:
+        return [
+            row[0]
+            for row in self.connection.execute(
+                "SELECT DISTINCT scoring_period FROM team_periods ORDER BY 1"
+            )
+        ]
+
+
+class ParsePipeline:
+    def __init__(self, workers: int, capacity: int) -> None:
+        self.pages: queue.Queue[tuple[Future, Callable[[], object]] | None] = queue.Queue(capacity)
+        self.workers = [threading.Thread(target=self.work, daemon=True) for _ in range(workers)]
+
+    def __enter__(self) -> "ParsePipeline":
+        for worker in self.workers:
+            worker.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        for _ in self.workers:
+            self.pages.put(None)
+        for worker in self.workers:
+            worker.join()
+
+    def submit[R](self, parse: Callable[[], R]) -> Future[R]:
+        future: Future[R] = Future()
+        self.pages.put((future, parse))
+        return future
+
+    def work(self) -> None:
+        while (page := self.pages.get()) is not None:
+            future, parse = page
+            try:
+                future.set_result(parse())
             except Exception as ex:
-                print(current_soup(browser).prettify())
-                raise ex
+                future.set_exception(ex)
+
+
+class StatsClient:
+    def __init__(self, browser: Browser, concurrency: int) -> None:
+        # Stats reports are plain server-rendered pages, so once the browser has logged in they
+        # can be fetched with its cookies without rendering them in Firefox
+        cookies = "; ".join(
+            f"{cookie['name']}={cookie['value']}" for cookie in browser.get_cookies()
+        )
+        self.concurrency = concurrency
+        self.pool = urllib3.PoolManager(
+            maxsize=concurrency,
+            block=True,
+            headers={
+                "Cookie": cookies,
+                "User-Agent": browser.execute_script("return navigator.userAgent"),
+            },
+            retries=urllib3.Retry(total=3, backoff_factor=0.5, status_forcelist=[502, 503, 504]),
+            timeout=urllib3.Timeout(connect=10, read=60),
+        )
+
+    def get(self, url: str) -> str:
+        response = self.pool.request("GET", url)
+        if response.status != 200:
+            raise click.ClickException(f"{url}: CBS responded with HTTP {response.status}")
+        if "/login" in (response.geturl() or ""):
+            raise click.ClickException(f"{url}: CBS no longer accepts the login session")
+        return response.data.decode()
+
+
+class LivePeriod:
+    def __init__(self, league: LeagueSettings, scoring_period: int, parser: str) -> None:
+        # Everything read is hashed, so each poll only parses the matchups and stats reports that
+        # changed since the last one. The teams, the stats table and the point leaders are kept
+        # from poll to poll and only take on the rows that changed
+        self.league = league
+        self.scoring_period = scoring_period
+        self.parser = parser
+        self.hashes: dict[str, str] = {}
+        self.teams: dict[str, Team] = {}
+        self.matchups: dict[str, tuple[Team | None, Team | None]] = {}
+        self.table: StatsTable | None = None
+        self.leaders: list[PointLeaders] = []
+        self.in_progress = True
+
+    def changed(self, key: str, source: str) -> bool:
+        digest = hashlib.sha256(source.encode()).hexdigest()
+        if self.hashes.get(key) == digest:
+            return False
+        self.hashes[key] = digest
+        return True
+
+    def poll(self, browser: Browser, client: StatsClient) -> set[str]:
+        changed = set()
+        rosters_changed = False
+
+        # A matchup is only clicked again once its line on the scoreboard has changed, and only
+        # parsed again once its rosters have
+        browser.navigate(scoreboard_url(self.league.home, self.scoring_period), "scoreboard")
+        self.in_progress = "/scoring/completed/" not in browser.current_url
+        scoreboard = BeautifulSoup(browser.page_source, self.parser, parse_only=SCOREBOARD_SCOPE)
+        for table in scoreboard.select("table[id^='matchup_hilite_']"):
+            matchup_id = table["id"]
+            if not self.changed(matchup_id, str(table)):
+                continue
+            page_source = browser.matchup_source(matchup_id)
+            if self.changed(f"{matchup_id}/rosters", read_parts(page_source, MATCHUP_READ)):
+                home, away = parse_matchup(page_source, self.parser, self.league.divisions)
+                rosters_changed |= self.update_matchup(matchup_id, home, away)
+                changed.add("teams")
+
+        def load_report(position: str) -> str:
+            return client.get(stats_report_url(self.league.home, self.scoring_period, position))
+
+        positions = self.league.stats_report_positions
+        reports: dict[str, list[StatsRow]] = {}
+        with ThreadPoolExecutor(client.concurrency) as executor:
+            pages = executor.map(load_report, positions)
+            for position, page_source in zip(positions, pages, strict=True):
+                if self.changed(position, read_parts(page_source, STATS_REPORT_READ)):
+                    reports[position] = stats_rows(page_source, self.parser, "P" in position)
+
+        if self.table is None:
+            self.table = StatsTable(reports)
+            self.table.assign_teams(list(self.teams.values()))
+            self.leaders = parse_point_leaders(self.table, self.league.all_star_positions)
+            changed.add("leaders")
+            return changed
+
+        table = self.table
+        # Leaders are on whichever teams roster them, so new rosters move them too
+        if rosters_changed:
+            table.assign_teams(list(self.teams.values()))
+        changed_rows = {
+            position: table.update(position, rows) for position, rows in reports.items()
+        }
+        leaders_changed = self.update_leaders(table, changed_rows)
+        if rosters_changed:
+            leaders_changed |= self.move_leaders(table)
+        if leaders_changed:
+            changed.add("leaders")
+        return changed
+
+    def update_leaders(self, table: StatsTable, changed_rows: dict[str, set[int]]) -> bool:
+        # A board is only touched when a player whose row changed is on it or would now make it.
+        # New scores are added to it in place, and it is only filled again from the table when a
+        # player has to leave it or ties with one on it, since the report's order breaks ties
+        updated = False
+        for board in self.leaders:
+            position, role = point_leaders_report(board)
+            if not (players := changed_rows.get(position)):
+                continue
+
+            rows = np.flatnonzero(
+                (table.position == table.positions.index(position))
+                & np.isin(table.id, list(players))
+            )
+            if role:
+                rows = rows[table.pitching(role)[rows]]
+            scorers = [table.player(row) for row in rows]
+            if players & {player.id for player in board.players} or any(
+                scorer.points in board.leaderboard.groups for scorer in scorers
+            ):
+                fill_point_leaders(board, table)
+                updated = True
+                continue
+            for scorer in scorers:
+                updated |= board.add(scorer)
+        return updated
+
+    def move_leaders(self, table: StatsTable) -> bool:
+        moved = False
+        for board in self.leaders:
+            players = board.players
+            owners = table.owner(np.array([player.id for player in players], np.int64))
+            for player, owner in zip(players, owners.tolist(), strict=True):
+                team = table.teams[owner] if owner >= 0 else "FA"
+                moved |= player.team != team
+                player.team = team
+        return moved
+
+    def update_matchup(self, matchup_id: str, home: Team | None, away: Team | None) -> bool:
+        previous = self.matchups.get(matchup_id)
+        if previous and previous[0] and previous[1]:
+            forget_result(*previous)
+
+        # Teams stay the same objects from poll to poll and only take on the new scores
+        rosters_changed = False
+        live = []
+        for team in (home, away):
+            if team is None:
+                live.append(None)
+                continue
+            known = self.teams.setdefault(team.name, team)
+            roster = {player.id for player in team.players}
+            rosters_changed |= known is team or {player.id for player in known.players} != roster
+            known.hitting_points = team.hitting_points
+            known.pitching_points = team.pitching_points
+            known.players = team.players
+            live.append(known)
+
+        self.matchups[matchup_id] = (live[0], live[1])
+        if live[0] and live[1]:
+            record_result(live[0], live[1])
+        return rosters_changed
+
+
+def read_parts(page_source: str, pattern: re.Pattern[str]) -> str:
+    # A page where none of the parts are found is compared whole, so that it is still parsed,
+    # and fails to parse, rather than being taken as unchanged
+    parts = pattern.findall(page_source)
+    return "".join(parts) if parts else page_source
+
+
+@click.group()
+def cli() -> None:
+    pass
+
+
+honorable_mentions_option = click.option(
+    "--honorable-mentions",
+    type=click.IntRange(min=0),
+    default=0,
+    show_default=True,
+    help="Also list this many runner up all star lineups, and what each all star adds over"
+    " their best replacement",
+)
+store_option = click.option(
+    "--store",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=Path("season.sqlite3"),
+    show_default=True,
+    help="SQLite database that keeps every summarised period and the season's totals",
+)
+
+
+def scraping_options(command: Callable) -> Callable:
+    options = [
+        click.option("-u", "--username", type=str),
+        click.option("-p", "--password", type=str),
+        click.option(
+            "--cache-dir",
+            type=click.Path(file_okay=False, path_type=Path),
+            default=Path(".cache/pages"),
+            show_default=True,
+            help="Where snapshots of scraped pages are kept",
+        ),
+        click.option(
+            "--sessions",
+            type=click.IntRange(min=1),
+            default=1,
+            show_default=True,
+            help="How many browser sessions share out the matchups",
+        ),
+        browser_options,
+        store_option,
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+def browser_options(command: Callable) -> Callable:
+    # Shared by every command that scrapes, whichever league or leagues it scrapes
+    options = [
+        click.option(
+            "--parser",
+            type=click.Choice(HTML_PARSERS),
+            default=DEFAULT_HTML_PARSER,
+            show_default=True,
+            help="How to parse CBS pages; lxml is much faster but has to be installed separately",
+        ),
+        click.option(
+            "--concurrency",
+            type=click.IntRange(min=1),
+            default=4,
+            show_default=True,
+            help="How many stats reports to download from CBS at once",
+        ),
+        click.option(
+            "--lean/--no-lean",
+            default=True,
+            show_default=True,
+            help="Keep Firefox from loading images, media, fonts, ads and trackers",
+        ),
+        click.option(
+            "--keep-warm",
+            is_flag=True,
+            help="Leave Selenium running afterwards and reuse the saved CBS login",
+        ),
+        click.option(
+            "--profile",
+            type=click.Path(dir_okay=False, path_type=Path),
+            help="Write how long each stage took to this JSON file and a Prometheus textfile",
+        ),
+    ]
+    for option in reversed(options):
+        command = option(command)
+    return command
+
+
+@cli.command("summary")
+@click.option("-s", "--scoring-period", type=int, required=True)
+@scraping_options
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Replay the scoring period from its snapshot instead of scraping CBS",
+)
+@click.option(
+    "--snapshot",
+    type=click.Path(dir_okay=False, path_type=Path),
+    help="Also save the parsed teams and point leaders here, as .json or .msgpack",
+)
+@honorable_mentions_option
+def generate_summary(
+    scoring_period: int,
+    username: str | None,
+    password: str | None,
+    cache_dir: Path,
+    sessions: int,
+    parser: str,
+    concurrency: int,
+    lean: bool,
+    keep_warm: bool,
+    profile: Path | None,
+    store: Path,
+    offline: bool,
+    snapshot: Path | None,
+    honorable_mentions: int,
+) -> None:
+    with profiling(profile):
+        if offline:
+            teams, leaders = parse_period(RD2_LEAGUE, cache_dir, scoring_period, parser)
+        else:
+            with logged_in_browsers(
+                RD2_LEAGUE, username, password, sessions, lean, keep_warm
+            ) as browsers:
+                client = StatsClient(browsers[0], concurrency)
+                teams, leaders = scrape_period(
+                    RD2_LEAGUE, browsers, client, scoring_period, cache_dir, parser
+                )
+
+        with SeasonStore(store) as season:
+            season.add_period(scoring_period, teams, leaders, RD2_LEAGUE.divisions)
+        if snapshot:
+            write_snapshot(snapshot, teams, leaders)
+        print(summary_markdown(RD2_LEAGUE, teams, leaders, honorable_mentions))
+
+
+@cli.command()
+@click.option(
+    "--from",
+    "snapshot",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    required=True,
+    help="Snapshot saved by summary --snapshot or by backfill",
+)
+@honorable_mentions_option
+def render(snapshot: Path, honorable_mentions: int) -> None:
+    print(summary_markdown(RD2_LEAGUE, *read_snapshot(snapshot), honorable_mentions))
+
+
+@cli.command()
+@click.option("--from", "first_period", type=click.IntRange(min=1), required=True)
+@click.option("--to", "last_period", type=click.IntRange(min=1), required=True)
+@scraping_options
+@click.option(
+    "--output-dir",
+    type=click.Path(file_okay=False, path_type=Path),
+    default=Path("summaries"),
+    show_default=True,
+    help="Where each scoring period's summary and snapshot are written",
+)
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=os.cpu_count(),
+    show_default=True,
+    help="How many processes parse and summarise scraped periods",
+)
+@honorable_mentions_option
+def backfill(
+    first_period: int,
+    last_period: int,
+    username: str | None,
+    password: str | None,
+    cache_dir: Path,
+    sessions: int,
+    parser: str,
+    concurrency: int,
+    lean: bool,
+    keep_warm: bool,
+    profile: Path | None,
+    store: Path,
+    output_dir: Path,
+    workers: int,
+    honorable_mentions: int,
+) -> None:
+    output_dir.mkdir(parents=True, exist_ok=True)
+    periods = [
+        scoring_period
+        for scoring_period in range(first_period, last_period + 1)
+        if not (output_dir / f"{scoring_period}.json").exists()
+    ]
+    unscraped = [
+        scoring_period
+        for scoring_period in periods
+        if not PageCache.has_snapshot(cache_dir, scoring_period)
+    ]
+
+    # Scraped periods are parsed and summarised in other processes while the browser moves on
+    # to the next period; spawn keeps the workers clear of the live browser sessions
+    with (
+        profiling(profile),
+        ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn")) as executor,
+    ):
+        summarise = partial(
+            summarise_period,
+            league=RD2_LEAGUE,
+            cache_dir=cache_dir,
+            parser=parser,
+            output_dir=output_dir,
+            store=store,
+            profile=bool(profile),
+            honorable_mentions=honorable_mentions,
+        )
+        futures: list[Future[tuple[int, list[dict]]]] = [
+            executor.submit(summarise, scoring_period)
+            for scoring_period in periods
+            if scoring_period not in unscraped
+        ]
+
+        if unscraped:
+            with logged_in_browsers(
+                RD2_LEAGUE, username, password, sessions, lean, keep_warm
+            ) as browsers:
+                client = StatsClient(browsers[0], concurrency)
+                for scoring_period in unscraped:
+                    parsed = scrape_period(
+                        RD2_LEAGUE, browsers, client, scoring_period, cache_dir, parser
+                    )
+                    futures.append(executor.submit(summarise, scoring_period, parsed=parsed))
+
+        for future in as_completed(futures):
+            scoring_period, records = future.result()
+            PROFILER.extend(records)
+            click.echo(f"Summarised scoring period {scoring_period}", err=True)
+
+
+def summarise_period(
+    scoring_period: int,
+    league: LeagueSettings,
+    cache_dir: Path,
+    parser: str,
+    output_dir: Path,
+    store: Path,
+    profile: bool,
+    honorable_mentions: int = 0,
+    parsed: tuple[list[Team], list[PointLeaders]] | None = None,
+) -> tuple[int, list[dict]]:
+    # Workers are reused between periods, so each one hands back only its own timings
+    PROFILER.enabled = profile
+    PROFILER.records = []
+
+    # Periods scraped in this run were parsed as they came in
+    teams, leaders = parsed or parse_period(league, cache_dir, scoring_period, parser)
+    summary = summary_markdown(league, teams, leaders, honorable_mentions)
+    (output_dir / f"{scoring_period}.md").write_text(summary + "\n")
+    with SeasonStore(store) as season:
+        season.add_period(scoring_period, teams, leaders, league.divisions)
+
+    # Periods still being played will change, so they are left to be picked up again next time
+    if PageCache.has_snapshot(cache_dir, scoring_period):
+        write_snapshot(output_dir / f"{scoring_period}.json", teams, leaders)
+
+    return scoring_period, PROFILER.records
+
+
+@cli.command()
+@click.option("-s", "--scoring-period", type=int, required=True)
+@click.option(
+    "--config",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=Path("leagues.toml"),
+    show_default=True,
+    help="TOML file with a [leagues.<name>] table for each league to summarise",
+)
+@click.option(
+    "--max-sessions",
+    type=click.IntRange(min=1),
+    default=4,
+    show_default=True,
+    help="How many browser sessions the leagues share between them at any one time",
+)
+@browser_options
+@click.option(
+    "--offline",
+    is_flag=True,
+    help="Replay each league's scoring period from its snapshot instead of scraping CBS",
+)
+@honorable_mentions_option
+def leagues(
+    scoring_period: int,
+    config: Path,
+    max_sessions: int,
+    parser: str,
+    concurrency: int,
+    lean: bool,
+    keep_warm: bool,
+    profile: Path | None,
+    offline: bool,
+    honorable_mentions: int,
+) -> None:
+    pending = load_leagues(config)
+    if crowded := [league.name for league in pending if league.sessions > max_sessions]:
+        raise click.ClickException(
+            f"{', '.join(crowded)} need more than the {max_sessions} sessions allowed"
+        )
+
+    # Other processes cannot ask for anything, so every login is settled first
+    if not offline:
+        for league in pending:
+            click.echo(f"Logging in to {league.name}", err=True)
+            league.username, league.password = Credentials(league.username, league.password).get()
+
+    failed = []
+    with ExitStack() as stack:
+        stack.enter_context(profiling(profile))
+        # Every league's browsers share one Selenium container, which is never asked for more
+        # sessions than it was started with; leagues start in order as sessions free up
+        endpoint = None
+        if not offline:
+            endpoint = stack.enter_context(WebDriver(max_sessions, keep_warm)).driver()
+        executor = stack.enter_context(
+            ProcessPoolExecutor(len(pending), mp_context=multiprocessing.get_context("spawn"))
+        )
+
+        summarise = partial(
+            summarise_league,
+            scoring_period=scoring_period,
+            parser=parser,
+            concurrency=concurrency,
+            lean=lean,
+            keep_warm=keep_warm,
+            profile=bool(profile),
+            offline=offline,
+            honorable_mentions=honorable_mentions,
+            endpoint=endpoint,
+        )
+
+        def sessions(league: League) -> int:
+            return 0 if offline else league.sessions
+
+        free_sessions = max_sessions
+        running: dict[Future[list[dict]], League] = {}
+        while pending or running:
+            while pending and sessions(pending[0]) <= free_sessions:
+                league = pending.pop(0)
+                free_sessions -= sessions(league)
+                running[executor.submit(summarise, league)] = league
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                league = running.pop(future)
+                free_sessions += sessions(league)
+                try:
+                    records = future.result()
+                except Exception as ex:
+                    failed.append(league.name)
+                    click.echo(f"Could not summarise {league.name}: {ex}", err=True)
+                    continue
+                PROFILER.extend([{**record, "league": league.name} for record in records])
+                click.echo(
+                    f"Summarised {league.name} to {league.output_dir / f'{scoring_period}.md'}",
+                    err=True,
+                )
+
+    if failed:
+        raise click.ClickException(f"{len(failed)} leagues failed: {', '.join(failed)}")
+
+
+def summarise_league(
+    league: League,
+    scoring_period: int,
+    parser: str,
+    concurrency: int,
+    lean: bool,
+    keep_warm: bool,
+    profile: bool,
+    offline: bool,
+    honorable_mentions: int,
+    endpoint: str | None,
+) -> list[dict]:
+    PROFILER.enabled = profile
+    PROFILER.records = []
+
+    parsed = None
+    if not offline:
+        with logged_in_browsers(
+            league.settings,
+            league.username,
+            league.password,
+            league.sessions,
+            lean,
+            keep_warm,
+            endpoint,
+        ) as browsers:
+            client = StatsClient(browsers[0], concurrency)
+            parsed = scrape_period(
+                league.settings, browsers, client, scoring_period, league.cache_dir, parser
+            )
+    records = PROFILER.records
+
+    league.output_dir.mkdir(parents=True, exist_ok=True)
+    _, summary_records = summarise_period(
+        scoring_period,
+        league.settings,
+        league.cache_dir,
+        parser,
+        league.output_dir,
+        league.store,
+        profile,
+        honorable_mentions,
+        parsed,
+    )
+    return records + summary_records
+
+
+def load_leagues(config: Path) -> list[League]:
+    try:
+        tables = tomllib.loads(config.read_text()).get("leagues", {})
+    except tomllib.TOMLDecodeError as ex:
+        raise click.ClickException(f"{config}: {ex}") from ex
+    if not tables:
+        raise click.ClickException(f"{config} has no [leagues.<name>] tables")
+
+    leagues = []
+    for name, table in tables.items():
+        if unknown := set(table) - LEAGUE_SETTINGS:
+            raise click.ClickException(
+                f"{config}: {name} has unknown settings {', '.join(sorted(unknown))}"
+            )
+        if not isinstance(table.get("sessions", 1), int) or table.get("sessions", 1) < 1:
+            raise click.ClickException(f"{config}: {name} needs at least 1 session")
+
+        # Anything left out is taken from this script's own league, and every league keeps its
+        # pages, login, summaries and season apart from the others'
+        output_dir = Path(table.get("output_dir", Path("summaries") / name))
+        divisions = dict(RD2_LEAGUE.divisions)
+        if "divisions" in table:
+            divisions = {
+                team: division for division, teams in table["divisions"].items() for team in teams
+            }
+        leagues.append(
+            League(
+                name=name,
+                settings=LeagueSettings(
+                    home=table.get("home", RD2_LEAGUE.home).rstrip("/"),
+                    divisions=divisions,
+                    all_star_positions=table.get(
+                        "all_star_positions", dict(RD2_LEAGUE.all_star_positions)
+                    ),
+                    nicknames={
+                        int(id_number): nickname
+                        for id_number, nickname in table.get(
+                            "nicknames", RD2_LEAGUE.nicknames
+                        ).items()
+                    },
+                    state_dir=Path(".cache/leagues") / name,
+                ),
+                username=table.get("username"),
+                password=table.get("password"),
+                sessions=table.get("sessions", 1),
+                cache_dir=Path(table.get("cache_dir", Path(".cache/leagues") / name / "pages")),
+                output_dir=output_dir,
+                store=Path(table.get("store", output_dir / "season.sqlite3")),
+            )
+        )
+    return leagues
+
+
+@cli.command()
+@click.option("-s", "--scoring-period", type=int, required=True)
+@click.option("-u", "--username", type=str)
+@click.option("-p", "--password", type=str)
+@browser_options
+@store_option
+@click.option(
+    "--interval",
+    type=click.IntRange(min=10),
+    default=300,
+    show_default=True,
+    help="Seconds between looks at the live scoreboard",
+)
+@click.option(
+    "--output",
+    type=click.Path(dir_okay=False, path_type=Path),
+    default=Path("summaries/live.md"),
+    show_default=True,
+    help="Where the summary is kept up to date while the scoring period is played",
+)
+@honorable_mentions_option
+def watch(
+    scoring_period: int,
+    username: str | None,
+    password: str | None,
+    parser: str,
+    concurrency: int,
+    lean: bool,
+    keep_warm: bool,
+    profile: Path | None,
+    store: Path,
+    interval: int,
+    output: Path,
+    honorable_mentions: int,
+) -> None:
+    live = LivePeriod(RD2_LEAGUE, scoring_period, parser)
+    rendered: list[str] = []
+    with (
+        profiling(profile),
+        logged_in_browsers(RD2_LEAGUE, username, password, 1, lean, keep_warm) as browsers,
+    ):
+        client = StatsClient(browsers[0], concurrency)
+        while True:
+            with PROFILER.stage("poll"):
+                changed = live.poll(browsers[0], client)
+
+            # Only the sections worked out from whatever changed are rendered again
+            if changed:
+                sections = summary_sections(
+                    RD2_LEAGUE, list(live.teams.values()), live.leaders, honorable_mentions
+                )
+                rendered = [
+                    markdown_section(header, type, lines())
+                    if not rendered or source in changed
+                    else rendered[index]
+                    for index, (source, header, type, lines) in enumerate(sections)
+                ]
+                output.parent.mkdir(parents=True, exist_ok=True)
+                output.with_suffix(".partial").write_text("\n\n".join(rendered) + "\n")
+                output.with_suffix(".partial").rename(output)
+                click.echo(
+                    f"{datetime.now():%H:%M:%S} updated the {' and '.join(sorted(changed))}"
+                    f" sections of {output}",
+                    err=True,
+                )
+
+            if not live.in_progress:
+                break
+            time.sleep(interval)
+
+    # Once the period is over it is kept with the rest of the season
+    with SeasonStore(store) as season:
+        season.add_period(
+            scoring_period, list(live.teams.values()), live.leaders, RD2_LEAGUE.divisions
+        )
+    print("\n\n".join(rendered))
+
+
+@cli.command()
+@store_option
+def season(store: Path) -> None:
+    if not store.exists():
+        raise click.ClickException(f"No season stored in {store}; run summary or backfill first")
+    with SeasonStore(store) as season:
+        print(season_markdown(season))
+
+
+@cli.command()
+@store_option
+@click.option(
+    "--schedule",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    required=True,
+    help="CSV of the matchups left to play, with scoring_period, home and away columns",
+)
+@click.option("--simulations", type=click.IntRange(min=1), default=100_000, show_default=True)
+@click.option(
+    "--playoff-teams",
+    type=click.IntRange(min=1),
+    default=6,
+    show_default=True,
+    help="How many teams make the playoffs: every division winner, then the best of the rest",
+)
+@click.option("--seed", type=int, help="Simulate the same seasons every time this seed is used")
+@click.option(
+    "--workers",
+    type=click.IntRange(min=1),
+    default=os.cpu_count(),
+    show_default=True,
+    help="How many processes simulate seasons",
+)
+def odds(
+    store: Path,
+    schedule: Path,
+    simulations: int,
+    playoff_teams: int,
+    seed: int | None,
+    workers: int,
+) -> None:
+    if not store.exists():
+        raise click.ClickException(f"No season stored in {store}; run summary or backfill first")
+    with SeasonStore(store) as season:
+        race = playoff_race(season, schedule, playoff_teams)
+        records = {
+            row["team"]: record_string(row["wins"], row["losses"], row["ties"])
+            for row in season.teams()
+        }
+
+    # Batches are seeded up front, so which worker simulates which batch makes no difference
+    batches = [SIMULATION_BATCH] * (simulations // SIMULATION_BATCH)
+    if simulations % SIMULATION_BATCH:
+        batches.append(simulations % SIMULATION_BATCH)
+    seeds = np.random.SeedSequence(seed).spawn(len(batches))
+    with ProcessPoolExecutor(
+        min(workers, len(batches)), mp_context=multiprocessing.get_context("spawn")
+    ) as executor:
+        counts = list(executor.map(race.simulate, seeds, batches))
+    division_wins = sum(count[0] for count in counts) / simulations
+    playoffs = sum(count[1] for count in counts) / simulations
+
+    order = sorted(
+        range(len(race.teams)),
+        key=lambda team: (playoffs[team], division_wins[team], race.standings[team]),
+        reverse=True,
+    )
+    table = [
+        "| **Team** | **Division** | **Record** | **Wins Division** | **Makes Playoffs** |",
+        "| :--- | :---: | :---: | :---: | :---: |",
+        *(
+            f"| {race.teams[team]}"
+            f" | {race.divisions[team]}"
+            f" | {records[race.teams[team]]}"
+            f" | {division_wins[team]:.1%}"
+            f" | {playoffs[team]:.1%} |"
+            for team in order
+        ),
+    ]
+    print(f"## Playoff Odds over {simulations} Simulated Seasons\n\n" + "\n".join(table))
+
+
+def playoff_race(season: SeasonStore, schedule_file: Path, playoff_teams: int) -> PlayoffRace:
+    rows = season.teams()
+    names = [row["team"] for row in rows]
+    codes = {name: code for code, name in enumerate(names)}
+    divisions = np.array([row["division"] for row in rows])
+    if not len(np.unique(divisions)) <= playoff_teams <= len(names):
+        raise click.ClickException(
+            f"Every division winner makes the playoffs, so there have to be between"
+            f" {len(np.unique(divisions))} and {len(names)} playoff teams"
+        )
+
+    # Teams that have played fewer than two weeks are as spread out as the league as a whole
+    schedule = season.schedule()
+    weekly = schedule.points[:, [schedule.teams.index(name) for name in names]]
+    counts = (~np.isnan(weekly)).sum(axis=0)
+    mean = np.nanmean(weekly, axis=0)
+    league_spread = float(np.nanstd(weekly, ddof=1)) if np.isfinite(weekly).sum() > 1 else 0.0
+    spread = np.full(len(names), league_spread)
+    spread[counts > 1] = np.nanstd(weekly[:, counts > 1], axis=0, ddof=1)
+
+    with schedule_file.open(newline="") as file:
+        matchups = list(csv.DictReader(file))
+    if unknown := {
+        name for matchup in matchups for name in (matchup["home"], matchup["away"])
+    } - set(codes):
+        raise click.ClickException(
+            f"{schedule_file}: {', '.join(sorted(unknown))} have no stored scoring periods"
+        )
+    played = set(season.periods())
+    left = sorted({int(matchup["scoring_period"]) for matchup in matchups} - played)
+    periods = {period: code for code, period in enumerate(left)}
+    matchups = [matchup for matchup in matchups if int(matchup["scoring_period"]) in periods]
+
+    return PlayoffRace(
+        teams=names,
+        divisions=divisions,
+        standings=np.array([row["wins"] + row["ties"] / 2 for row in rows]),
+        points=np.array([row["hitting_points"] + row["pitching_points"] for row in rows]),
+        mean=mean,
+        spread=spread,
+        period=np.array([periods[int(m["scoring_period"])] for m in matchups], np.intp),
+        home=np.array([codes[m["home"]] for m in matchups], np.intp),
+        away=np.array([codes[m["away"]] for m in matchups], np.intp),
+        playoff_teams=playoff_teams,
+    )
+
+
+def write_snapshot(path: Path, teams: list[Team], leaders: list[PointLeaders]) -> None:
+    model = {
+        "version": SNAPSHOT_VERSION,
+        "teams": [
+            {
+                "name": team.name,
+                "hitting_points": team.hitting_points,
+                "pitching_points": team.pitching_points,
+                "wins": team.wins,
+                "losses": team.losses,
+                "ties": team.ties,
+                "players": [
+                    [
+                        player.name,
+                        player.id,
+                        player.active_points,
+                        player.active_batter,
+                        player.active_pitcher,
+                    ]
+                    for player in sorted(team.players, key=operator.attrgetter("id"))
+                ],
+            }
+            for team in teams
+        ],
+        "leaders": [
+            {
+                "position": board.position,
+                "max_scorers": board.max_scorers,
+                "descending": board.descending,
+                "players": [
+                    [player.name, player.id, player.points, player.team] for player in board.players
+                ],
+            }
+            for board in leaders
+        ],
+    }
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial_file = path.with_suffix(f"{path.suffix}.partial")
+    if snapshot_format(path) == ".msgpack":
+        partial_file.write_bytes(msgpack_module().packb(model))
+    else:
+        partial_file.write_text(json.dumps(model, separators=(",", ":")))
+    partial_file.rename(path)
+
+
+def read_snapshot(path: Path) -> tuple[list[Team], list[PointLeaders]]:
+    if snapshot_format(path) == ".msgpack":
+        model = msgpack_module().unpackb(path.read_bytes())
+    else:
+        model = json.loads(path.read_text())
+    if model.get("version") != SNAPSHOT_VERSION:
+        raise click.ClickException(
+            f"{path} is a version {model.get('version')} snapshot but version"
+            f" {SNAPSHOT_VERSION} is needed; summarise its scoring period again"
+        )
+
+    teams = []
+    for team_model in model["teams"]:
+        team = Team(team_model["name"], team_model["hitting_points"], team_model["pitching_points"])
+        team.players = {RosteredPlayer(*player) for player in team_model["players"]}
+        team.wins = team_model["wins"]
+        team.losses = team_model["losses"]
+        team.ties = team_model["ties"]
+        teams.append(team)
+
+    leaders = []
+    for board_model in model["leaders"]:
+        board = PointLeaders(
+            board_model["position"], board_model["max_scorers"], board_model["descending"]
+        )
+        for name, id_number, points, team_name in board_model["players"]:
+            player = ScoringPlayer(name, id_number, points)
+            player.team = team_name
+            board.add(player)
+        leaders.append(board)
+
+    return teams, leaders
+
+
+def snapshot_format(path: Path) -> str:
+    if path.suffix not in SNAPSHOT_SUFFIXES:
+        raise click.ClickException(
+            f"{path}: snapshots are saved as {' or '.join(SNAPSHOT_SUFFIXES)}"
+        )
+    return path.suffix
+
+
+def msgpack_module():
+    try:
+        import msgpack  # type: ignore
+    except ImportError as ex:
+        raise click.ClickException(
+            "msgpack snapshots need msgpack, which is installed with the msgpack extra"
+        ) from ex
+    return msgpack
+
+
+@contextmanager
+def profiling(path: Path | None) -> Iterator[None]:
+    if not path:
+        yield
+        return
+
+    PROFILER.enabled = True
+    try:
+        yield
+    finally:
+        PROFILER.write(path)
+
+
+@contextmanager
+def logged_in_browsers(
+    league: LeagueSettings,
+    username: str | None,
+    password: str | None,
+    sessions: int,
+    lean: bool,
+    keep_warm: bool,
+    endpoint: str | None = None,
+) -> Iterator[list[Browser]]:
+    credentials = Credentials(username, password)
+    if not keep_warm:
+        credentials.get()
+
+    weights = PageWeights(lean, league.page_weights_file)
+    waits = Waits()
+    with ExitStack() as stack:
+        # Browsers join a Selenium container that is already up when given its endpoint
+        if not endpoint:
+            endpoint = stack.enter_context(WebDriver(sessions, keep_warm)).driver()
+        stack.callback(lambda: click.echo("\n".join(weights.report()), err=True))
+
+        def open_browser(_: int) -> Browser:
+            browser = stack.enter_context(
+                Browser(
+                    weights,
+                    waits,
+                    options=Browser.options(lean),
+                    command_executor=endpoint,
+                )
+            )
+            login(browser, league.home, credentials, league.session_file if keep_warm else None)
+            return browser
+
+        with ThreadPoolExecutor(sessions) as executor:
+            yield list(executor.map(open_browser, range(sessions)))
+
+
+@PROFILER.stage("scrape_period")
+def scrape_period(
+    league: LeagueSettings,
+    browsers: list[Browser],
+    client: StatsClient,
+    scoring_period: int,
+    cache_dir: Path,
+    parser: str,
+) -> tuple[list[Team], list[PointLeaders]]:
+    cache = PageCache(cache_dir, scoring_period, offline=False)
+    with (
+        ParsePipeline(PARSE_WORKERS, PARSE_QUEUE_SIZE) as pipeline,
+        ThreadPoolExecutor(1) as executor,
+    ):
+        # Stats reports do not need a browser, so they download while the matchups are clicked
+        reports = executor.submit(
+            scrape_stats_reports, league, client, scoring_period, cache, parser, pipeline
+        )
+        matchups = scrape_matchups(league, browsers, scoring_period, cache, parser, pipeline)
+        stats = reports.result()
+
+        teams = league_teams(matchup.result() for matchup in matchups)
+        table = StatsTable({position: rows.result() for position, rows in stats.items()})
+    cache.commit()
+
+    table.assign_teams(teams)
+    return teams, parse_point_leaders(table, league.all_star_positions)
+
+
+@PROFILER.stage("parse_period")
+def parse_period(
+    league: LeagueSettings, cache_dir: Path, scoring_period: int, parser: str
+) -> tuple[list[Team], list[PointLeaders]]:
+    cache = PageCache(cache_dir, scoring_period, offline=True)
+    teams = parse_matchups(league, cache, scoring_period, parser)
+    table = parse_stats_table(league, cache, scoring_period, parser)
+    table.assign_teams(teams)
+
+    return teams, parse_point_leaders(table, league.all_star_positions)
+
+
+@PROFILER.stage("summary_markdown")
+def summary_markdown(
+    league: LeagueSettings,
+    teams: list[Team],
+    leaders: list[PointLeaders],
+    honorable_mentions: int = 0,
+) -> str:
+    return "\n\n".join(
+        markdown_section(header, type, lines())
+        for _, header, type, lines in summary_sections(league, teams, leaders, honorable_mentions)
+    )
+
+
+# Which of the period's teams or point leaders a section of the summary is worked out from
+SummarySection = tuple[str, str, MarkdownType, Callable[[], list[str]]]
 
-    players_by_team = {player.id: team.name for team in teams for player in team.players}
-    for point_leaders in leaders:
-        for player in point_leaders.players:
-            player.team = players_by_team.get(player.id, "FA")
 
+def summary_sections(
+    league: LeagueSettings,
+    teams: list[Team],
+    leaders: list[PointLeaders],
+    honorable_mentions: int = 0,
+) -> list[SummarySection]:
     all_stars = {
         (point_leaders.position, point_leaders.descending): point_leaders
         for point_leaders in leaders
     }
 
-    teams_by_name = {team.name: team for team in teams}
-    matchups = {
-        Matchup(team, teams_by_name[opponent], teams_by_name, None)
-        for team in teams
-        for opponent in team.opponents
-    }
+    @cache
+    def superlatives() -> MatchupSuperlatives:
+        return MatchupSuperlatives(teams)
 
-    markdown = [
-        markdown_section(
-            "Top Three Teams of the Week",
-            MarkdownType.BULLET,
-            top_scorers(teams),
-        ),
-        markdown_section(
+    sections: list[SummarySection] = [
+        ("teams", "Top Three Teams of the Week", MarkdownType.BULLET, lambda: top_scorers(teams)),
+        (
+            "teams",
             "Worst Three Teams of the Week",
             MarkdownType.BULLET,
-            top_scorers(teams, False),
+            lambda: top_scorers(teams, False),
         ),
-        markdown_section(
+        (
+            "teams",
             "Offensive Powerhouses",
             MarkdownType.BULLET,
-            top_scorers(teams, points=lambda t: t.hitting_points),
+            lambda: top_scorers(teams, points=lambda t: t.hitting_points),
         ),
-        markdown_section(
+        (
+            "teams",
             "Forgot Their Bats",
             MarkdownType.BULLET,
-            top_scorers(teams, descending=False, points=lambda t: t.hitting_points),
+            lambda: top_scorers(teams, descending=False, points=lambda t: t.hitting_points),
         ),
-        markdown_section(
+        (
+            "teams",
             "Pitching Factories",
             MarkdownType.BULLET,
-            top_scorers(teams, points=lambda t: t.pitching_points),
+            lambda: top_scorers(teams, points=lambda t: t.pitching_points),
         ),
-        markdown_section(
+        (
+            "teams",
             "Burnt Down Factories",
             MarkdownType.BULLET,
-            top_scorers(teams, descending=False, points=lambda t: t.pitching_points),
+            lambda: top_scorers(teams, descending=False, points=lambda t: t.pitching_points),
         ),
-        markdown_section(
+        (
+            "leaders",
             "Multi-Start Saviors",
             MarkdownType.BULLET,
-            top_scorers(all_stars[("2SP", True)].players),
+            lambda: top_scorers(all_stars[("2SP", True)].players),
         ),
-        markdown_section(
+        (
+            "leaders",
             "1 Start Gods",
             MarkdownType.BULLET,
-            top_scorers(all_stars[("1SP", True)].players),
+            lambda: top_scorers(all_stars[("1SP", True)].players),
         ),
-        markdown_section(
+        (
+            "leaders",
             "No Start Workhorses",
             MarkdownType.BULLET,
-            top_scorers(all_stars[("RP", True)].players),
+            lambda: top_scorers(all_stars[("RP", True)].players),
         ),
-        markdown_section(
+        (
+            "leaders",
             "Had a Bad Day",
             MarkdownType.BULLET,
-            top_scorers(all_stars[("SP", False)].players, descending=False),
+            lambda: top_scorers(all_stars[("SP", False)].players, descending=False),
         ),
-        markdown_section(
+        (
+            "leaders",
             "The Bullpen Disasters",
             MarkdownType.BULLET,
-            top_scorers(all_stars[("RP", False)].players, descending=False),
+            lambda: top_scorers(all_stars[("RP", False)].players, descending=False),
         ),
-        markdown_section(
+        (
+            "leaders",
             "All Stars",
             MarkdownType.BULLET,
-            all_star_lineup(all_stars.values()),
+            lambda: all_star_lineup(
+                all_stars.values(), league.all_star_positions, replacements=honorable_mentions > 0
+            ),
         ),
-        markdown_section(
+    ]
+    if honorable_mentions:
+        sections.append(
+            (
+                "leaders",
+                "Honorable Mentions",
+                MarkdownType.TABLE,
+                lambda: honorable_mentions_table(
+                    all_stars.values(), league.all_star_positions, honorable_mentions
+                ),
+            )
+        )
+    sections += [
+        (
+            "teams",
             "Blowout of the Week",
             MarkdownType.BULLET,
-            top_scorers(
-                {matchup.with_mode(MatchupMode.BLOWOUT) for matchup in matchups},
-                num_scorers=1,
-            ),
+            lambda: superlatives().lines(MatchupMode.BLOWOUT),
         ),
-        markdown_section(
+        (
+            "teams",
             "Closest Matchup of the Week",
             MarkdownType.BULLET,
-            top_scorers(
-                {matchup.with_mode(MatchupMode.CLOSEST) for matchup in matchups},
-                descending=False,
-                num_scorers=1,
-            ),
+            lambda: superlatives().lines(MatchupMode.CLOSEST),
         ),
-        markdown_section(
+        (
+            "teams",
             "Strongest Loss",
             MarkdownType.BULLET,
-            top_scorers(
-                {
-                    matchup.with_mode(MatchupMode.STRONGEST_LOSS)
-                    for matchup in matchups
-                    if matchup.points > 0
-                },
-                num_scorers=1,
-                points=lambda m: m.team2.points,
-            ),
+            lambda: superlatives().lines(MatchupMode.STRONGEST_LOSS),
         ),
-        markdown_section(
+        (
+            "teams",
             "No Wins for the Effort",
             MarkdownType.BULLET,
-            top_scorers(
-                {
-                    matchup.with_mode(MatchupMode.UNLUCKIEST)
-                    for matchup in matchups
-                    if not matchup.team2.wins
-                },
-                num_scorers=1,
-                points=lambda m: m.team2.points,
-            ),
+            lambda: superlatives().lines(MatchupMode.UNLUCKIEST),
         ),
-        markdown_section(
+        (
+            "teams",
             "Weakest Win",
             MarkdownType.BULLET,
-            top_scorers(
-                {
-                    matchup.with_mode(MatchupMode.WEAKEST_WIN)
-                    for matchup in matchups
-                    if matchup.points > 0
-                },
-                descending=False,
-                num_scorers=1,
-                points=lambda m: m.team1.points,
-            ),
+            lambda: superlatives().lines(MatchupMode.WEAKEST_WIN),
         ),
-        markdown_section(
+        (
+            "teams",
             "Dirty Cheater",
             MarkdownType.BULLET,
-            top_scorers(
-                {
-                    matchup.with_mode(MatchupMode.LUCKIEST)
-                    for matchup in matchups
-                    if not matchup.team1.losses
-                },
-                descending=False,
-                num_scorers=1,
-                points=lambda m: m.team1.points,
-            ),
+            lambda: superlatives().lines(MatchupMode.LUCKIEST),
+        ),
+        (
+            "teams",
+            "Division Stats",
+            MarkdownType.TABLE,
+            lambda: division_table(teams, league.divisions),
         ),
-        markdown_section("Division Stats", MarkdownType.TABLE, division_table(teams)),
     ]
+    return sections
+
+
+def season_markdown(season: SeasonStore) -> str:
+    rows = season.teams()
+    teams = [
+        Team(row["team"], round(row["hitting_points"], 2), round(row["pitching_points"], 2))
+        for row in rows
+    ]
+    periods = season.periods()
+    if not periods:
+        return ""
+
+    standings = sorted(
+        rows,
+        key=lambda row: (
+            row["wins"] + row["ties"] / 2,
+            row["hitting_points"] + row["pitching_points"],
+        ),
+        reverse=True,
+    )
+    markdown = [
+        f"## Season So Far: Scoring Periods {periods[0]}-{periods[-1]}"
+        if len(periods) > 1
+        else f"## Season So Far: Scoring Period {periods[0]}",
+        markdown_section("Top Three Teams of the Season", MarkdownType.BULLET, top_scorers(teams)),
+        markdown_section(
+            "Offensive Powerhouses of the Season",
+            MarkdownType.BULLET,
+            top_scorers(teams, points=lambda t: t.hitting_points),
+        ),
+        markdown_section(
+            "Pitching Factories of the Season",
+            MarkdownType.BULLET,
+            top_scorers(teams, points=lambda t: t.pitching_points),
+        ),
+        markdown_section(
+            "Best Weeks of the Season",
+            MarkdownType.BULLET,
+            [
+                f"{row['team']}, {points_string(round(row['points'], 2))}"
+                f" in scoring period {row['scoring_period']}"
+                for row in season.best_weeks(3)
+            ],
+        ),
+        markdown_section(
+            "Top Active Scorers of the Season",
+            MarkdownType.BULLET,
+            [
+                f"{row['name']}, {points_string(round(row['active_points'], 2))}"
+                for row in season.top_players(5)
+            ],
+        ),
+        markdown_section(
+            "Standings",
+            MarkdownType.TABLE,
+            [
+                "| **Team** | **Division** | **Record** | **Points** | **Best Week** |",
+                "| :--- | :---: | :---: | :---: | :---: |",
+                *(
+                    f"| {row['team']} | {row['division']}"
+                    f" | {record_string(row['wins'], row['losses'], row['ties'])}"
+                    f" | {round(row['hitting_points'] + row['pitching_points'], 2)}"
+                    f" | {round(row['best_points'], 2)} |"
+                    for row in standings
+                ),
+            ],
+        ),
+        markdown_section(
+            "All-Play Standings", MarkdownType.TABLE, all_play_table(season.schedule())
+        ),
+        markdown_section("Division Stats", MarkdownType.TABLE, season_division_table(rows)),
+    ]
+    return "\n\n".join(markdown)
+
+
+def all_play_table(schedule: Schedule) -> list[str]:
+    # Luck is how many more games a team won than it would have against an average schedule,
+    # and schedule strength is how its opponents fared against the whole league
+    order = sorted(
+        range(len(schedule.teams)),
+        key=lambda team: (schedule.all_play_share[team], schedule.teams[team]),
+        reverse=True,
+    )
+    all_play = zip(
+        schedule.all_play_wins, schedule.all_play_losses, schedule.all_play_ties, strict=True
+    )
+    records = [record_string(*record) for record in all_play]
+    return [
+        "| **Team** | **All-Play** | **Expected Wins** | **Luck** | **Opponent Points**"
+        " | **Schedule Strength** |",
+        "| :--- | :---: | :---: | :---: | :---: | :---: |",
+        *(
+            f"| {schedule.teams[team]}"
+            f" | {records[team]}"
+            f" | {schedule.expected_wins[team]:.1f}"
+            f" | {schedule.luck[team]:+.1f}"
+            f" | {schedule.opponent_points[team]:.1f}"
+            f" | {schedule.schedule_strength[team]:.3f} |"
+            for team in order
+        ),
+    ]
+
+
+def season_division_table(rows: list[sqlite3.Row]) -> list[str]:
+    divisions: dict[str, list[sqlite3.Row]] = defaultdict(list)
+    for row in sorted(rows, key=lambda row: row["division"]):
+        divisions[row["division"]].append(row)
+
+    table = [
+        [f"**{name}**" for name in ["Division", *divisions]],
+        [":---:"] * (len(divisions) + 1),
+        ["**Points**"]
+        + [
+            str(round(sum(row["hitting_points"] + row["pitching_points"] for row in division), 2))
+            for division in divisions.values()
+        ],
+        ["**Record**"]
+        + [
+            record_string(
+                sum(row["outside_wins"] for row in division),
+                sum(row["outside_losses"] for row in division),
+                sum(row["outside_ties"] for row in division),
+            )
+            for division in divisions.values()
+        ],
+    ]
+    return [f"| {' | '.join(row)} |" for row in table]
 
-    print("\n\n".join(markdown))
 
+def record_string(wins: int, losses: int, ties: int) -> str:
+    return f"{wins}-{losses}-{ties}".removesuffix("-0")
 
-def login(browser: Remote, username: str, password: str) -> None:
-    browser.get(LEAGUE_HOME)
-    WebDriverWait(browser, 30).until(expect.url_contains("/login"))
+
+@PROFILER.stage("login")
+def login(browser: Browser, home: str, credentials: Credentials, session_file: Path | None) -> None:
+    if session_file and restore_session(browser, home, session_file, credentials.username):
+        return
+
+    username, password = credentials.get()
+    browser.navigate(home, "login")
+    browser.attempt("login_form", lambda timeout: browser.wait_until(timeout, LOGIN_FORM_SCRIPT))
 
     username_field = browser.find_element(By.NAME, "email")
     username_field.clear()
@@ -394,47 +2915,168 @@ def login(browser: Remote, username: str, password: str) -> None:
     password_field.send_keys(password)
 
     browser.find_element(By.CSS_SELECTOR, "button[type=submit]").click()
-    WebDriverWait(browser, 30).until(expect.url_contains(LEAGUE_HOME))
-    browser.refresh()
+    # Waiting on the league's own page once the login has gone through means it is already
+    # loaded, logged in, and does not need fetching again
+    browser.attempt(
+        "logged_in", lambda timeout: browser.wait_until(timeout, LOGGED_IN_SCRIPT, home)
+    )
 
+    if session_file:
+        save_session(browser, session_file, username)
 
-def parse_matchups(browser: Remote, scoring_period: int) -> list[Team]:
-    browser.get(f"{LEAGUE_HOME}/scoring/completed/{scoring_period}")
-    teams: dict[str, Team] = {}
-    for tag in browser.find_elements(By.CSS_SELECTOR, "table[id^='matchup_hilite_']"):
-        browser.find_element(By.CSS_SELECTOR, f"table#{tag.get_property('id')}").click()
 
-        matchup_soup = current_soup(browser)
-        home = load_team("home", matchup_soup, teams)
-        away = load_team("away", matchup_soup, teams)
+def restore_session(browser: Browser, home: str, session_file: Path, username: str | None) -> bool:
+    try:
+        session = json.loads(session_file.read_text())
+    except FileNotFoundError:
+        return False
+
+    if username and session["username"] != username:
+        return False
+    if datetime.now(UTC) - datetime.fromisoformat(session["saved_at"]) > SESSION_TTL:
+        return False
+    if any(cookie.get("expiry", math.inf) <= time.time() for cookie in session["cookies"]):
+        return False
+
+    # Cookies can only be set for the site the browser is on, and CBS sends logged out visitors
+    # to its login page, so the cookies are set from there and the league is loaded again
+    browser.navigate(home, "login")
+    for cookie in session["cookies"]:
+        with suppress(WebDriverException):
+            browser.add_cookie(cookie)
+    browser.navigate(home, "home")
+
+    return "/login" not in browser.current_url
+
+
+def save_session(browser: Browser, session_file: Path, username: str) -> None:
+    session = {
+        "username": username,
+        "saved_at": datetime.now(UTC).isoformat(),
+        "cookies": browser.get_cookies(),
+    }
+
+    session_file.parent.mkdir(parents=True, exist_ok=True)
+    partial_file = session_file.with_suffix(f".{threading.get_ident()}.partial")
+    partial_file.touch(mode=0o600)
+    partial_file.write_text(json.dumps(session))
+    partial_file.rename(session_file)
+
+
+def scoreboard_url(home: str, scoring_period: int) -> str:
+    return f"{home}/scoring/completed/{scoring_period}"
+
+
+def matchup_ids(scoreboard_source: str, parser: str) -> list[str]:
+    soup = BeautifulSoup(scoreboard_source, parser, parse_only=SCOREBOARD_SCOPE)
+    return [tag["id"] for tag in soup.select("table[id^='matchup_hilite_']")]
+
+
+def scrape_matchups(
+    league: LeagueSettings,
+    browsers: list[Browser],
+    scoring_period: int,
+    cache: PageCache,
+    parser: str,
+    pipeline: ParsePipeline,
+) -> list[Future[tuple[Team | None, Team | None]]]:
+    url = scoreboard_url(league.home, scoring_period)
+
+    def load_scoreboard() -> str:
+        browsers[0].navigate(url, "scoreboard")
+        # CBS only shows completed scores once a period is over, so being sent elsewhere means
+        # the period is still being played
+        cache.in_progress = "/scoring/completed/" not in browsers[0].current_url
+        return browsers[0].page_source
+
+    def load_matchup(browser: Browser, matchup_id: str) -> str:
+        return browser.matchup_source(matchup_id)
+
+    def load_matchups(browser: Browser, matchup_ids: list[str]) -> None:
+        if browser is not browsers[0]:
+            browser.navigate(url, "scoreboard")
+        for matchup_id in matchup_ids:
+            page_source = cache.page_source(
+                url, "matchup", partial(load_matchup, browser, matchup_id), matchup_id
+            )
+            matchups[matchup_id] = pipeline.submit(
+                partial(parse_matchup, page_source, parser, league.divisions)
+            )
+
+    matchups: dict[str, Future[tuple[Team | None, Team | None]]] = {}
+    ids = matchup_ids(cache.page_source(url, "scoreboard", load_scoreboard), parser)
+
+    # Each session clicks through its own share of the matchups
+    shares = [ids[index :: len(browsers)] for index in range(len(browsers))]
+    with ThreadPoolExecutor(len(browsers)) as executor:
+        list(executor.map(load_matchups, browsers, shares))
+    return [matchups[matchup_id] for matchup_id in ids]
+
+
+def parse_matchups(
+    league: LeagueSettings, cache: PageCache, scoring_period: int, parser: str
+) -> list[Team]:
+    url = scoreboard_url(league.home, scoring_period)
+
+    return league_teams(
+        parse_matchup(cache.read(url, matchup_id), parser, league.divisions)
+        for matchup_id in matchup_ids(cache.read(url), parser)
+    )
+
+
+def parse_matchup(
+    page_source: str, parser: str, divisions: dict[str, str]
+) -> tuple[Team | None, Team | None]:
+    with PROFILER.stage("parse", page="matchup") as record:
+        matchup_soup = BeautifulSoup(page_source, parser, parse_only=MATCHUP_SCOPE)
+        home = load_team("home", matchup_soup, divisions)
+        away = load_team("away", matchup_soup, divisions)
+        record["bytes"] = len(page_source.encode())
+        record["rows"] = sum(len(team.players) for team in (home, away) if team)
+    return home, away
+
+
+def league_teams(matchups: Iterable[tuple[Team | None, Team | None]]) -> list[Team]:
+    # The teams are always loaded in scoreboard order so that the records come out the same
+    # however the matchups were shared out between browser sessions and parsers; a team met
+    # again keeps its roster from its first matchup
+    teams: dict[str, Team] = {}
+    for home_team, away_team in matchups:
+        home = teams.setdefault(home_team.name, home_team) if home_team else None
+        away = teams.setdefault(away_team.name, away_team) if away_team else None
 
         if home and away:
-            if home.points < away.points:
-                home.losses.append(away.name)
-                away.wins.append(home.name)
-            elif home.points > away.points:
-                home.wins.append(away.name)
-                away.losses.append(home.name)
-            else:
-                home.ties.append(away.name)
-                away.ties.append(home.name)
+            record_result(home, away)
 
     return [teams[name] for name in teams]
 
 
-def current_soup(browser: Remote) -> BeautifulSoup:
-    return BeautifulSoup(browser.page_source, "html.parser")
+def record_result(home: Team, away: Team) -> None:
+    if home.points < away.points:
+        home.losses.append(away.name)
+        away.wins.append(home.name)
+    elif home.points > away.points:
+        home.wins.append(away.name)
+        away.losses.append(home.name)
+    else:
+        home.ties.append(away.name)
+        away.ties.append(home.name)
+
+
+def forget_result(home: Team, away: Team) -> None:
+    for team, opponent in [(home, away), (away, home)]:
+        for results in (team.wins, team.losses, team.ties):
+            if opponent.name in results:
+                results.remove(opponent.name)
+                break
 
 
-def load_team(home_or_away: str, soup: BeautifulSoup, teams: dict[str, Team]) -> Team | None:
-    team_name = soup.select_one(f".teamname #{home_or_away}_big_name").string.strip()
-    if team_name not in DIVISIONS:
+def load_team(home_or_away: str, soup: BeautifulSoup, divisions: dict[str, str]) -> Team | None:
+    team_name = soup.select_one(f"#{home_or_away}_big_name").string.strip()
+    if team_name not in divisions:
         return None
-    if team_name in teams:
-        return teams[team_name]
 
     team = Team(team_name)
-    teams[team.name] = team
 
     player_tags = re.compile(r"^player_(active|reserve)_\d+_\d+$")
     for tag in soup.select_one(f"#{home_or_away}_team_roster").find_all(id=player_tags):
@@ -473,59 +3115,112 @@ def player_name_and_id(soup: Tag, name_tag: str) -> tuple[str, int]:
         ) from ex
 
 
-def parse_point_leaders(browser: Remote, scoring_period: int) -> list[PointLeaders]:
-    leaders = []
-
-    num_all_stars = sum(ALL_STAR_POSITIONS.values())
-    for position in ALL_STAR_POSITIONS:
-        soups = point_leader_soups(browser, scoring_period, position)
-        leaders.append(point_leaders(soups, position, num_all_stars, True))
-
-    soups = point_leader_soups(browser, scoring_period, "SP:RP")
-    for position in ["2SP", "1SP", "RP"]:
-        leaders.append(point_leaders(soups, position, 3, True))
-    for position in ["SP", "RP"]:
-        leaders.append(point_leaders(soups, position, 3, False))
-
-    return leaders
-
-
-def point_leader_soups(browser: Remote, scoring_period: int, position: str) -> list[Tag]:
-    browser.get(
-        f"{LEAGUE_HOME}/stats/data-stats-report/all"
+def stats_report_url(home: str, scoring_period: int, position: str) -> str:
+    return (
+        f"{home}/stats/data-stats-report/all"
         f":{position}/period-{scoring_period}/standard/stats?print_rows=9999"
     )
-    return current_soup(browser).select("tbody > tr[valign='top']")
 
 
-def point_leaders(
-    soups: list[Tag], position: str, max_scorers: int, descending: bool
-) -> PointLeaders:
-    point_leaders = PointLeaders(position, max_scorers, descending)
+def scrape_stats_reports(
+    league: LeagueSettings,
+    client: StatsClient,
+    scoring_period: int,
+    cache: PageCache,
+    parser: str,
+    pipeline: ParsePipeline,
+) -> dict[str, Future[list[StatsRow]]]:
+    def load_report(position: str) -> Future[list[StatsRow]]:
+        url = stats_report_url(league.home, scoring_period, position)
+        page_source = cache.page_source(url, "stats_report", partial(client.get, url))
+        return pipeline.submit(partial(stats_rows, page_source, parser, pitchers="P" in position))
+
+    with ThreadPoolExecutor(client.concurrency) as executor:
+        return dict(
+            zip(
+                league.stats_report_positions,
+                executor.map(load_report, league.stats_report_positions),
+                strict=True,
+            )
+        )
 
-    for soup in soups if descending else reversed(soups):
-        if "P" in position:
-            columns = soup.select("tr > td[align='right']")
-            games = int(columns[1].string.strip())
-            games_started = int(columns[2].string.strip())
 
-            if games == 0:
-                continue
-            if position == "2SP" and games_started < 2:
-                continue
-            if position == "1SP" and games_started != 1:
-                continue
-            if "SP" in position and games_started == 0:
-                continue
-            if position == "RP" and games_started > 0:
-                continue
+def parse_stats_table(
+    league: LeagueSettings, cache: PageCache, scoring_period: int, parser: str
+) -> StatsTable:
+    return StatsTable(
+        {
+            position: stats_rows(
+                cache.read(stats_report_url(league.home, scoring_period, position)),
+                parser,
+                pitchers="P" in position,
+            )
+            for position in league.stats_report_positions
+        }
+    )
 
-        name, id_number = player_name_and_id(soup, "aria-label")
-        points = float(soup.select_one("tr > td.bold").string.strip())
-        if not point_leaders.add(ScoringPlayer(name, id_number, points)):
-            break
 
-    return point_leaders
+def parse_point_leaders(
+    table: StatsTable, all_star_positions: dict[str, int]
+) -> list[PointLeaders]:
+    num_all_stars = sum(all_star_positions.values())
+    boards = [PointLeaders(position, num_all_stars, True) for position in all_star_positions]
+    boards += [PointLeaders(position, 3, descending) for position, descending in PITCHING_LEADERS]
+
+    for board in boards:
+        fill_point_leaders(board, table)
+    return boards
+
+
+def point_leaders_report(board: PointLeaders) -> tuple[str, str | None]:
+    # All star boards are ranked from their own report, and pitching boards from the pitchers
+    # in one role
+    if board.position in dict(PITCHING_LEADERS):
+        return "SP:RP", board.position
+    return board.position, None
+
+
+def fill_point_leaders(board: PointLeaders, table: StatsTable) -> None:
+    position, role = point_leaders_report(board)
+    where = table.pitching(role) if role else None
+    board.clear()
+    for player in table.top(position, board.max_scorers, board.descending, where):
+        board.add(player)
+
+
+def stats_rows(page_source: str, parser: str, pitchers: bool) -> list[StatsRow]:
+    with PROFILER.stage("parse", page="stats_report") as record:
+        rows = read_stats_rows(page_source, parser, pitchers)
+        record["bytes"] = len(page_source.encode())
+        record["rows"] = len(rows)
+    return rows
+
+
+def read_stats_rows(page_source: str, parser: str, pitchers: bool) -> list[StatsRow]:
+    soup = BeautifulSoup(page_source, parser, parse_only=STATS_REPORT_SCOPE)
+    # An empty report still has its table, so a report without one is a page that is not read
+    # right, and would otherwise just leave its sections out of the summary
+    if soup.find("table") is None:
+        raise click.ClickException("A stats report has no table of players to read")
+
+    rows = []
+    for row in soup.select("table tr[valign='top']"):
+        columns = row.find_all("td", recursive=False)
+        points_column = next(column for column in columns if "bold" in column.get("class", []))
+        games = games_started = None
+        if pitchers:
+            right_columns = [column for column in columns if column.get("align") == "right"]
+            games = int(right_columns[1].string.strip())
+            games_started = int(right_columns[2].string.strip())
+
+        name, id_number = player_name_and_id(row, "aria-label")
+        rows.append(
+            StatsRow(id_number, name, float(points_column.string.strip()), games, games_started)
+        )
+
+    # The rows hold plain values only, so the tree can go as soon as they have been read
+    soup.decompose()
+    return rows
 
 
 def markdown_section(header: str, type: MarkdownType, lines: list[str]) -> str:
@@ -569,13 +3264,10 @@ def ranked_scorers(
     num_scorers: int,
     points: Callable[[T], float],
 ) -> list[tuple[float, list[T]]]:
-    return sorted(
-        [
-            (group_points, list(group))
-            for group_points, group in groupby(sorted(scorers, key=points), key=points)
-        ],
-        reverse=descending,
-    )[:num_scorers]
+    leaderboard = Leaderboard(num_scorers, descending, points, by_group=True)
+    for scorer in scorers:
+        leaderboard.add(scorer)
+    return leaderboard.ranked()
 
 
 def scorer_string(scorer: T, points: float) -> str:
@@ -633,87 +3325,271 @@ def points_string(points: float) -> str:
     return f"{points} point" if points == 1 else f"{points} points"
 
 
-def all_star_lineup(all_stars: Iterable[PointLeaders]) -> list[str]:
-    scorers = {}
-    scorer_positions = defaultdict(set)
-    position_scorers = defaultdict(set)
-    lineup_candidates: dict[str, list[int]] = defaultdict(list)
+def all_star_lineup(
+    all_stars: Iterable[PointLeaders],
+    all_star_positions: dict[str, int],
+    replacements: bool = False,
+) -> list[str]:
+    slots, scorers, scorer_positions = all_star_candidates(all_stars, all_star_positions)
+    points = {scorer.id: scorer.points for scorer in scorers.values()}
+    with PROFILER.stage("all_star_lineup") as record:
+        lineups = optimal_lineups(slots, scorer_positions, points)
+        record["rows"] = len(lineups)
+
+    values: dict[int, float] = {}
+    if replacements and lineups:
+        with PROFILER.stage("replacement_values"):
+            values = replacement_values(slots, scorer_positions, points, lineups[0])
+
+    lines = []
+    for lineup in lineups:
+        for position, player in zip(slots, best_first(slots, lineup, points), strict=True):
+            if player is None:
+                continue
+            line = f"{position}: {scorer_string(scorers[player], scorers[player].points)}"
+            if player in values:
+                line += f", {points_string(round(values[player], 2))} better than any replacement"
+            lines.append(line)
+    return lines
+
+
+def honorable_mentions_table(
+    all_stars: Iterable[PointLeaders], all_star_positions: dict[str, int], count: int
+) -> list[str]:
+    slots, scorers, scorer_positions = all_star_candidates(all_stars, all_star_positions)
+    points = {scorer.id: scorer.points for scorer in scorers.values()}
+    # Every lineup tied for the best total is already listed as an all star lineup
+    with PROFILER.stage("honorable_mentions") as record:
+        lineups = ranked_lineups(slots, scorer_positions, points)
+        best = lineup_points(next(lineups, []), points)
+        mentions = [
+            best_first(slots, lineup, points)
+            for lineup in islice(
+                (lineup for lineup in lineups if lineup_points(lineup, points) < best), count
+            )
+        ]
+        record["rows"] = len(mentions)
+    if not mentions:
+        return []
+
+    table = [
+        [
+            "**Position**",
+            *[
+                f"**{rank}: {points_string(round(lineup_points(lineup, points), 2))}**"
+                for rank, lineup in enumerate(mentions, start=1)
+            ],
+        ],
+        [":---:"] * (len(mentions) + 1),
+    ]
+    for index, position in enumerate(slots):
+        table.append(
+            [
+                f"**{position}**",
+                *[
+                    scorer_string(scorers[player], scorers[player].points)
+                    if (player := lineup[index]) is not None
+                    else ""
+                    for lineup in mentions
+                ],
+            ]
+        )
+    return [f"| {' | '.join(row)} |" for row in table]
+
+
+def all_star_candidates(
+    all_stars: Iterable[PointLeaders], all_star_positions: dict[str, int]
+) -> tuple[list[str], dict[int, ScoringPlayer], dict[int, set[str]]]:
+    scorers: dict[int, ScoringPlayer] = {}
+    scorer_positions: dict[int, set[str]] = defaultdict(set)
 
     for leaders in all_stars:
-        if leaders.position not in ALL_STAR_POSITIONS:
+        if leaders.position not in all_star_positions:
             continue
 
         for scorer in leaders.players:
             scorers[scorer.id] = scorer
             scorer_positions[scorer.id].add(leaders.position)
-            position_scorers[leaders.position].add(scorer.id)
 
-    def add_new_scorers(base_scorers: Iterable[int], number: int) -> None:
-        players = [
-            scorers[scorer]
-            for scorer in set(base_scorers)
-            if scorer not in set(itertools.chain(*lineup_candidates.values()))
-        ]
+    slots = [
+        position_string
+        for position, count in all_star_positions.items()
+        for position_string in [position] * count
+    ]
+    return slots, scorers, scorer_positions
 
-        for _, group in ranked_scorers(players, True, number, lambda s: s.points):
-            for scorer in group:
-                for position in scorer_positions[scorer.id]:
-                    lineup_candidates[position].append(scorer.id)
 
-    add_new_scorers(scorers.keys(), 10)
+Lineup = list[int | None]
 
-    while lacking_positions := [
-        position
-        for position, count in ALL_STAR_POSITIONS.items()
-        if len(lineup_candidates[position]) < count
-    ]:
-        lacking_position_scorers = [
-            scorer for position in lacking_positions for scorer in position_scorers[position]
-        ]
-        add_new_scorers(lacking_position_scorers, 1)
 
-    lineup_options: list[list[int]] = [
-        list(lineup_candidates[position])
-        for position, count in ALL_STAR_POSITIONS.items()
-        for _ in range(0, count)
-    ]
+def lineup_points(lineup: Lineup, points: dict[int, float]) -> float:
+    # fsum adds up the same players to the same total in any order, so ties compare equal
+    return math.fsum(points[player] for player in lineup if player is not None)
 
-    points = 0.0
-    lineups = []
-    known_lineups = set()
-    for lineup in product(*lineup_options):
-        if len(lineup_set := frozenset(lineup)) != len(lineup):
-            continue
-        if lineup_set in known_lineups:
-            continue
-        known_lineups.add(lineup_set)
 
-        lineup_points: float = sum(scorers[scorer].points for scorer in lineup)
-        if lineup_points < points:
-            continue
-        elif lineup_points == points:
+def best_first(slots: list[str], lineup: Lineup, points: dict[int, float]) -> Lineup:
+    # Slots of the same position are interchangeable, so whichever slot the solver left a
+    # player in, each position lists its players from the highest scorer down
+    by_position: dict[str, list[int | None]] = defaultdict(list)
+    for position, player in zip(slots, lineup, strict=True):
+        by_position[position].append(player)
+    for players in by_position.values():
+        players.sort(key=lambda player: -points[player] if player is not None else math.inf)
+    return [by_position[position].pop(0) for position in slots]
+
+
+def optimal_lineups(
+    slots: list[str], eligibility: dict[int, set[str]], points: dict[int, float]
+) -> list[Lineup]:
+    # Lineups that fit in the slots form a matroid, so a lineup is optimal exactly when it fills
+    # as many slots as possible from each prefix of the players ranked by points. Only players
+    # tied at a boundary leave any choice, so enumerating those choices yields each optimal
+    # lineup exactly once, up to the first MAX_ALL_STAR_LINEUPS of them.
+    ranked = sorted(eligibility, key=points.__getitem__, reverse=True)
+    groups = [list(group) for _, group in groupby(ranked, key=points.__getitem__)]
+
+    picks: list[int] = []
+    lineup: Lineup = [None] * len(slots)
+    for group in groups:
+        if None not in lineup:
+            break
+
+        picked = 0
+        for player in group:
+            if extended := extend_lineup(lineup, slots, eligibility, player):
+                lineup = extended
+                picked += 1
+        picks.append(picked)
+
+    lineups: list[Lineup] = []
+
+    def choose(index: int, lineup: Lineup) -> None:
+        if index == len(picks):
             lineups.append(lineup)
-        else:
-            points = lineup_points
-            lineups = [lineup]
+            return
+
+        # Tied players who cannot fit in the lineup on their own cannot fit in it with others,
+        # and a choice is given up on as soon as one of its players does not fit
+        group = [
+            player
+            for player in groups[index]
+            if extend_lineup(lineup, slots, eligibility, player) is not None
+        ]
 
-    positions = [
-        position_string
-        for position, count in ALL_STAR_POSITIONS.items()
-        for position_string in [position] * count
-    ]
+        def pick(start: int, remaining: int, lineup: Lineup) -> None:
+            if not remaining:
+                choose(index + 1, lineup)
+                return
+            for position in range(start, len(group) - remaining + 1):
+                if len(lineups) == MAX_ALL_STAR_LINEUPS:
+                    return
+                if extended := extend_lineup(lineup, slots, eligibility, group[position]):
+                    pick(position + 1, remaining - 1, extended)
+
+        pick(0, picks[index], lineup)
+
+    choose(0, [None] * len(slots))
+    return lineups
+
+
+def ranked_lineups(
+    slots: list[str],
+    eligibility: dict[int, set[str]],
+    points: dict[int, float],
+    excluded: frozenset[int] = frozenset(),
+) -> Iterator[Lineup]:
+    # Murty's ranking, over lineups as sets of players rather than as assignments to slots so
+    # that no lineup comes up twice with its players shuffled around. The best lineup that has
+    # to keep some players and must leave out others is still picked greedily, as every lineup
+    # fits in the slots as a matroid. Once it is yielded, the lineups left under the same
+    # constraints are split up by which of its greedy picks they first leave out, so each
+    # lineup after it costs another greedy pick per player.
+    ranked = sorted(eligibility, key=points.__getitem__, reverse=True)
+
+    def best(kept: tuple[int, ...], left_out: frozenset[int]) -> tuple[Lineup, list[int]]:
+        lineup: Lineup = [None] * len(slots)
+        for player in kept:
+            lineup = extend_lineup(lineup, slots, eligibility, player) or lineup
+
+        picks = []
+        for player in ranked:
+            if None not in lineup:
+                break
+            if player in left_out or player in kept:
+                continue
+            if extended := extend_lineup(lineup, slots, eligibility, player):
+                lineup = extended
+                picks.append(player)
+        return lineup, picks
+
+    lineup, picks = best((), excluded)
+    size = len(slots) - lineup.count(None)
+    heap = [(-lineup_points(lineup, points), 0, lineup, picks, (), excluded)]
+    pushed = 1
+    while heap:
+        _, _, lineup, picks, kept, left_out = heapq.heappop(heap)
+        yield lineup
+
+        for index, player in enumerate(picks):
+            child_kept = (*kept, *picks[:index])
+            child_left_out = left_out | {player}
+            child, child_picks = best(child_kept, child_left_out)
+            # Lineups that can no longer fill as many slots are not lineups of this league
+            if len(slots) - child.count(None) == size:
+                heapq.heappush(
+                    heap,
+                    (
+                        -lineup_points(child, points),
+                        pushed,
+                        child,
+                        child_picks,
+                        child_kept,
+                        child_left_out,
+                    ),
+                )
+                pushed += 1
+
+
+def replacement_values(
+    slots: list[str], eligibility: dict[int, set[str]], points: dict[int, float], lineup: Lineup
+) -> dict[int, float]:
+    # What each player adds over the best lineup that could be picked without them
+    best = lineup_points(lineup, points)
+    return {
+        player: best
+        - lineup_points(
+            next(ranked_lineups(slots, eligibility, points, frozenset([player]))), points
+        )
+        for player in lineup
+        if player is not None
+    }
 
-    return [
-        f"{position}: {scorer_string(scorers[player], scorers[player].points)}"
-        for lineup in lineups
-        for position, player in zip(positions, lineup, strict=False)
-    ]
+
+def extend_lineup(
+    lineup: Lineup, slots: list[str], eligibility: dict[int, set[str]], player: int
+) -> Lineup | None:
+    extended = list(lineup)
+
+    def augment(player: int, visited: set[int]) -> bool:
+        for index, slot in enumerate(slots):
+            if index in visited or slot not in eligibility[player]:
+                continue
+            visited.add(index)
+
+            current = extended[index]
+            if current is None or augment(current, visited):
+                extended[index] = player
+                return True
+
+        return False
+
+    return extended if augment(player, set()) else None
 
 
-def division_table(teams: list[Team]) -> list[str]:
+def division_table(teams: list[Team], team_divisions: dict[str, str]) -> list[str]:
     divisions: dict[str, list[Team]] = OrderedDict()
     for team in teams:
-        divisions.setdefault(DIVISIONS[team.name], []).append(team)
+        divisions.setdefault(team_divisions[team.name], []).append(team)
 
     if any(len(division) < 2 for division in divisions.values()):
         return []
@@ -725,9 +3601,9 @@ def division_table(teams: list[Team]) -> list[str]:
 
     records = [
         (
-            len([r for t in div_teams for r in t.wins if DIVISIONS[r] != division]),
-            len([r for t in div_teams for r in t.losses if DIVISIONS[r] != division]),
-            len([r for t in div_teams for r in t.ties if DIVISIONS[r] != division]),
+            len([r for t in div_teams for r in t.wins if team_divisions[r] != division]),
+            len([r for t in div_teams for r in t.losses if team_divisions[r] != division]),
+            len([r for t in div_teams for r in t.ties if team_divisions[r] != division]),
         )
         for division, div_teams in divisions.items()
     ]
@@ -738,12 +3614,10 @@ def division_table(teams: list[Team]) -> list[str]:
         ["**Points**"] + [str(sum(points)) for points in scores],
         ["**Points/Team**"] + [str(round(statistics.mean(s), 1)) for s in scores],
         ["**Std. Deviation**"] + [str(round(statistics.stdev(s), 1)) for s in scores],
-        ["**Record**"]
-        + [f"{wins}-{losses}-{ties}".removesuffix("-0") for wins, losses, ties in records]
-        + [""],
+        ["**Record**"] + [record_string(*record) for record in records] + [""],
     ]
     return [f"| {' | '.join(row)} |" for row in table]
 
 
 if __name__ == "__main__":
-    generate_summary()
+    cli()
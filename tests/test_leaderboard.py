@@ -0,0 +1,50 @@
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import main
+
+
+def leaderboard(size: int, by_group: bool, descending: bool = True) -> main.Leaderboard[float]:
+    return main.Leaderboard(size, descending, lambda points: points, by_group)
+
+
+class LeaderboardTest(unittest.TestCase):
+    def test_unsorted_entries_stay_within_size(self) -> None:
+        board = leaderboard(3, by_group=False)
+        for points in (10, 9, 8, 10):
+            board.add(points)
+
+        self.assertEqual(board.ranked(), [(10, [10, 10]), (9, [9])])
+        self.assertEqual(board.count, 3)
+
+    def test_ties_with_the_last_entry_are_kept(self) -> None:
+        board = leaderboard(3, by_group=False)
+        for points in (8, 10, 9, 8, 7, 10):
+            board.add(points)
+
+        self.assertEqual(board.ranked(), [(10, [10, 10]), (9, [9])])
+
+    def test_unsorted_entries_keep_the_best_groups(self) -> None:
+        board = leaderboard(2, by_group=True, descending=False)
+        for points in (5, 3, 9, 3, 1, 5, 4):
+            board.add(points)
+
+        self.assertEqual(board.ranked(), [(1, [1]), (3, [3, 3])])
+
+    def test_matches_sorting_every_entry(self) -> None:
+        entries = [(index * 7919) % 23 for index in range(200)]
+        for size in range(1, 12):
+            board = leaderboard(size, by_group=False)
+            for points in entries:
+                board.add(points)
+
+            ranked = sorted(entries, reverse=True)
+            expected = [points for points in ranked if points >= ranked[size - 1]]
+            self.assertEqual([points for _, group in board.ranked() for points in group], expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import random
+import sys
+import time
+import unittest
+from itertools import combinations, permutations
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import main
+
+SLOTS: list[str] = [
+    position for position, count in main.RD2_LEAGUE.all_star_positions.items() for _ in range(count)
+]
+
+SMALL_SLOTS: list[str] = ["C", "1B", "OF", "OF", "U"]
+
+
+def random_league(rng: random.Random, players: int) -> tuple[dict[int, set[str]], dict[int, float]]:
+    positions = sorted(set(SMALL_SLOTS))
+    eligibility = {
+        player: set(rng.sample(positions, rng.randint(1, 2))) for player in range(players)
+    }
+    # Few distinct scores, so that ties come up often
+    points = {player: rng.randint(-1, 4) / 2 for player in range(players)}
+    return eligibility, points
+
+
+def fits(players: tuple[int, ...], slots: list[str], eligibility: dict[int, set[str]]) -> bool:
+    return any(
+        all(slots[slot] in eligibility[player] for player, slot in zip(players, order, strict=True))
+        for order in permutations(range(len(slots)), len(players))
+    )
+
+
+def brute_force_lineups(
+    slots: list[str], eligibility: dict[int, set[str]], points: dict[int, float]
+) -> dict[frozenset[int], float]:
+    # Every set of players that fills as many slots as any set can, with its total
+    for size in range(len(slots), -1, -1):
+        lineups = {
+            frozenset(players): main.lineup_points(list(players), points)
+            for players in combinations(eligibility, size)
+            if fits(players, slots, eligibility)
+        }
+        if lineups:
+            return lineups
+    return {}
+
+
+class OptimalLineupsTest(unittest.TestCase):
+    def test_matches_brute_force(self) -> None:
+        rng = random.Random(0)
+        for case in range(200):
+            eligibility, points = random_league(rng, rng.randint(3, 10))
+            expected = brute_force_lineups(SMALL_SLOTS, eligibility, points)
+            best = max(expected.values(), default=0)
+
+            with self.subTest(case=case):
+                lineups = main.optimal_lineups(SMALL_SLOTS, eligibility, points)
+                found = {frozenset(lineup) - {None} for lineup in lineups}
+                self.assertEqual(len(found), len(lineups))
+                optimal = {lineup for lineup, total in expected.items() if total == best}
+                if len(optimal) <= main.MAX_ALL_STAR_LINEUPS:
+                    self.assertEqual(found, optimal)
+                else:
+                    self.assertEqual(len(found), main.MAX_ALL_STAR_LINEUPS)
+                    self.assertLessEqual(found, optimal)
+
+    def test_a_large_tie_finishes_quickly(self) -> None:
+        # Six starters fill a position each, and the outfield and utility slots are left to
+        # hundreds of scoreless bench players
+        eligibility = {player: {position} for player, position in enumerate(SLOTS[:6])}
+        points = dict.fromkeys(eligibility, 10.0)
+        for player in range(100, 400):
+            eligibility[player] = {"OF", "U"}
+            points[player] = 0.0
+
+        start = time.perf_counter()
+        lineups = main.optimal_lineups(SLOTS, eligibility, points)
+        self.assertLess(time.perf_counter() - start, 1)
+
+        self.assertEqual(len(lineups), main.MAX_ALL_STAR_LINEUPS)
+        self.assertEqual(len({frozenset(lineup) for lineup in lineups}), len(lineups))
+        for lineup in lineups:
+            self.assertNotIn(None, lineup)
+            self.assertEqual(main.lineup_points(lineup, points), 60)
+
+
+class RankedLineupsTest(unittest.TestCase):
+    def test_matches_brute_force(self) -> None:
+        rng = random.Random(1)
+        for case in range(200):
+            eligibility, points = random_league(rng, rng.randint(3, 9))
+            excluded = frozenset(rng.sample(list(eligibility), rng.randint(0, 2)))
+            expected = brute_force_lineups(
+                SMALL_SLOTS,
+                {player: eligibility[player] for player in eligibility if player not in excluded},
+                points,
+            )
+
+            with self.subTest(case=case):
+                lineups = list(main.ranked_lineups(SMALL_SLOTS, eligibility, points, excluded))
+                found = [frozenset(lineup) - {None} for lineup in lineups]
+                totals = [main.lineup_points(lineup, points) for lineup in lineups]
+                # Every lineup comes up exactly once, best first
+                self.assertEqual(len(set(found)), len(found))
+                self.assertEqual(set(found), set(expected))
+                self.assertEqual(totals, sorted(totals, reverse=True))
+                self.assertEqual(totals, [expected[lineup] for lineup in found])
+
+    def test_replacement_values_match_brute_force(self) -> None:
+        rng = random.Random(2)
+        for case in range(100):
+            eligibility, points = random_league(rng, rng.randint(3, 9))
+            lineup = main.optimal_lineups(SMALL_SLOTS, eligibility, points)[0]
+
+            with self.subTest(case=case):
+                values = main.replacement_values(SMALL_SLOTS, eligibility, points, lineup)
+                self.assertEqual(set(values), set(lineup) - {None})
+                for player, value in values.items():
+                    without = brute_force_lineups(
+                        SMALL_SLOTS,
+                        {
+                            other: positions
+                            for other, positions in eligibility.items()
+                            if other != player
+                        },
+                        points,
+                    )
+                    best = main.lineup_points(lineup, points)
+                    self.assertAlmostEqual(value, best - max(without.values()))
+
+
+if __name__ == "__main__":
+    unittest.main()
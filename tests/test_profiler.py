@@ -0,0 +1,30 @@
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import main
+
+
+class ProfilerTest(unittest.TestCase):
+    def test_label_values_are_escaped(self) -> None:
+        profiler = main.Profiler()
+        profiler.enabled = True
+        with profiler.stage("summary", league='The "Big" \\ League\nWest'):
+            pass
+
+        with tempfile.TemporaryDirectory() as directory:
+            profile = Path(directory) / "profile.json"
+            profiler.write(profile)
+            lines = profile.with_suffix(".prom").read_text().splitlines()
+
+        samples = [line for line in lines if line.startswith(f"{main.METRICS_PREFIX}_stage_")]
+        self.assertEqual(len(samples), 4)
+        for sample in samples:
+            self.assertIn('league="The \\"Big\\" \\\\ League\\nWest"', sample)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import random
+import sqlite3
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import main
+
+
+def random_period(rng: random.Random) -> list[main.Team]:
+    names = list(main.RD2_LEAGUE.divisions)
+    rng.shuffle(names)
+    teams = []
+    for name in names[:8]:
+        team = main.Team(name)
+        for player in rng.sample(range(40), 6):
+            active = rng.random() < 0.7
+            pitcher = active and rng.random() < 0.4
+            points = rng.randint(-4, 40) / 2
+            team.add(
+                main.RosteredPlayer(
+                    f"Player {player}", player, points, active and not pitcher, pitcher
+                )
+            )
+        teams.append(team)
+    for home, away in zip(teams[::2], teams[1::2], strict=True):
+        main.record_result(home, away)
+    return teams
+
+
+def totals(store: main.SeasonStore) -> tuple[list[tuple], list[tuple], list[tuple]]:
+    def rows(found: list[sqlite3.Row]) -> list[tuple]:
+        return [
+            tuple(round(value, 6) if isinstance(value, float) else value for value in row)
+            for row in found
+        ]
+
+    return rows(store.teams()), rows(store.top_players(100)), rows(store.best_weeks(100))
+
+
+class SeasonStoreTest(unittest.TestCase):
+    def test_adding_a_period_again_replaces_it(self) -> None:
+        rng = random.Random(0)
+        for case in range(10):
+            periods = {period: random_period(rng) for period in range(1, 7)}
+            redone = rng.sample(list(periods), 3)
+            with (
+                tempfile.TemporaryDirectory() as directory,
+                main.SeasonStore(Path(directory) / "once.sqlite3") as once,
+                main.SeasonStore(Path(directory) / "again.sqlite3") as again,
+            ):
+                for period, teams in periods.items():
+                    once.add_period(period, teams, [], main.RD2_LEAGUE.divisions)
+
+                # Periods are first stored as they stood part way through, then as they ended
+                for period in redone:
+                    again.add_period(period, random_period(rng), [], main.RD2_LEAGUE.divisions)
+                for period, teams in periods.items():
+                    again.add_period(period, teams, [], main.RD2_LEAGUE.divisions)
+                for period in redone:
+                    again.add_period(period, periods[period], [], main.RD2_LEAGUE.divisions)
+
+                with self.subTest(case=case):
+                    self.assertEqual(totals(again), totals(once))
+
+
+if __name__ == "__main__":
+    unittest.main()
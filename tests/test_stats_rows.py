@@ -0,0 +1,46 @@
+import sys
+import unittest
+from pathlib import Path
+
+import click
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import main
+
+ROWS: str = (
+    '<tr valign="top"><td><a class="playerLink" href="/players/playerpage/1"'
+    ' aria-label="Player 1 SP NYY">Player 1</a></td><td align="right">NYY</td>'
+    '<td align="right">2</td><td align="right">1</td><td class="bold">12.5</td></tr>'
+    '<tr valign="top"><td><a class="playerLink" href="/players/playerpage/2"'
+    ' aria-label="Player 2 RP BOS">Player 2</a></td><td align="right">BOS</td>'
+    '<td align="right">3</td><td align="right">0</td><td class="bold">4.0</td></tr>'
+)
+EXPECTED: list[main.StatsRow] = [
+    main.StatsRow(1, "Player 1", 12.5, 2, 1),
+    main.StatsRow(2, "Player 2", 4.0, 3, 0),
+]
+
+
+class StatsRowsTest(unittest.TestCase):
+    def test_rows_are_read_with_or_without_a_tbody(self) -> None:
+        for parser in main.HTML_PARSERS:
+            for table in (f"<table><tbody>{ROWS}</tbody></table>", f"<table>{ROWS}</table>"):
+                with self.subTest(parser=parser, table=table[:14]):
+                    page = f"<html><body><div>Stats</div>{table}</body></html>"
+                    self.assertEqual(main.read_stats_rows(page, parser, pitchers=True), EXPECTED)
+
+    def test_an_empty_table_has_no_rows(self) -> None:
+        for parser in main.HTML_PARSERS:
+            with self.subTest(parser=parser):
+                page = "<html><body><table></table></body></html>"
+                self.assertEqual(main.read_stats_rows(page, parser, pitchers=False), [])
+
+    def test_a_page_without_a_table_fails(self) -> None:
+        for parser in main.HTML_PARSERS:
+            with self.subTest(parser=parser), self.assertRaises(click.ClickException):
+                main.read_stats_rows("<html><body>Sign in</body></html>", parser, pitchers=False)
+
+
+if __name__ == "__main__":
+    unittest.main()
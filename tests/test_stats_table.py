@@ -0,0 +1,174 @@
+import random
+import sys
+import unittest
+from collections.abc import Callable
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import main
+
+
+def random_reports(rng: random.Random) -> dict[str, list[main.StatsRow]]:
+    reports = {}
+    for code, position in enumerate(main.RD2_LEAGUE.stats_report_positions):
+        pitchers = "P" in position
+        players = rng.sample(range(code * 1000, code * 1000 + 80), rng.randint(0, 40))
+        rows = [
+            main.StatsRow(
+                player,
+                f"Player {player}",
+                rng.randint(-4, 20) / 2,
+                rng.randint(0, 3) if pitchers else None,
+                rng.randint(0, 2) if pitchers else None,
+            )
+            for player in players
+        ]
+        # CBS lists the best scorers first
+        reports[position] = sorted(rows, key=lambda row: -row.points)
+    return reports
+
+
+def random_teams(rng: random.Random, reports: dict[str, list[main.StatsRow]]) -> list[main.Team]:
+    players = sorted({row.id for rows in reports.values() for row in rows})
+    rng.shuffle(players)
+    teams = []
+    for index in range(4):
+        team = main.Team(f"Team {index}")
+        for player in players[index * 12 : (index + 1) * 12]:
+            team.add(main.RosteredPlayer(f"Player {player}", player, 0, False, False))
+        teams.append(team)
+    return teams
+
+
+ROLES: dict[str, Callable[[main.StatsRow], bool]] = {
+    "2SP": lambda row: row.games > 0 and row.games_started >= 2,
+    "1SP": lambda row: row.games > 0 and row.games_started == 1,
+    "SP": lambda row: row.games > 0 and row.games_started > 0,
+    "RP": lambda row: row.games > 0 and row.games_started == 0,
+}
+
+
+def expected_top(
+    rows: list[main.StatsRow], count: int, descending: bool, teams: list[main.Team]
+) -> list[tuple[int, float, str]]:
+    # Ties keep the order they are met in when the report is read from the relevant end
+    read = rows if descending else rows[::-1]
+    ranked = sorted(read, key=lambda row: -row.points if descending else row.points)
+    if len(ranked) > count:
+        cutoff = ranked[count - 1].points
+        ranked = ranked[:count] + [row for row in ranked[count:] if row.points == cutoff]
+
+    owners = {player.id: team.name for team in teams for player in team.players}
+    return [(row.id, row.points, owners.get(row.id, "FA")) for row in ranked]
+
+
+def scorers(players: list[main.ScoringPlayer]) -> list[tuple[int, float, str]]:
+    return [(player.id, player.points, player.team) for player in players]
+
+
+class StatsTableTest(unittest.TestCase):
+    def test_top_matches_sorting_the_reports(self) -> None:
+        rng = random.Random(0)
+        for case in range(50):
+            reports = random_reports(rng)
+            teams = random_teams(rng, reports)
+            table = main.StatsTable(reports)
+            table.assign_teams(teams)
+
+            for position in main.RD2_LEAGUE.all_star_positions:
+                for descending in (True, False):
+                    count = rng.randint(1, 12)
+                    with self.subTest(case=case, position=position, descending=descending):
+                        self.assertEqual(
+                            scorers(table.top(position, count, descending)),
+                            expected_top(reports[position], count, descending, teams),
+                        )
+
+            for role, in_role in ROLES.items():
+                for descending in (True, False):
+                    pitched = [row for row in reports["SP:RP"] if in_role(row)]
+                    with self.subTest(case=case, role=role, descending=descending):
+                        self.assertEqual(
+                            scorers(table.top("SP:RP", 3, descending, table.pitching(role))),
+                            expected_top(pitched, 3, descending, teams),
+                        )
+
+
+def changed_reports(
+    rng: random.Random, reports: dict[str, list[main.StatsRow]]
+) -> dict[str, list[main.StatsRow]]:
+    # Some players score, change role, start playing or drop out of a report, and CBS may list
+    # players who tie in a different order than before
+    changed = {}
+    for code, position in enumerate(main.RD2_LEAGUE.stats_report_positions):
+        rows = {row.id: row for row in reports[position]}
+        if rng.random() < 0.5:
+            for _ in range(rng.randint(1, 4)):
+                action = rng.random()
+                if action < 0.6 and rows:
+                    row = rows[rng.choice(list(rows))]
+                    games_started = row.games_started
+                    if games_started is not None and rng.random() < 0.2:
+                        games_started = rng.randint(0, 2)
+                    rows[row.id] = row._replace(
+                        points=row.points + rng.choice([-1, -0.5, 0.5, 1, 2]),
+                        games_started=games_started,
+                    )
+                elif action < 0.8:
+                    player = rng.randrange(code * 1000, code * 1000 + 80)
+                    rows.setdefault(
+                        player,
+                        main.StatsRow(
+                            player,
+                            f"Player {player}",
+                            rng.randint(-4, 20) / 2,
+                            1 if "P" in position else None,
+                            rng.randint(0, 2) if "P" in position else None,
+                        ),
+                    )
+                elif rows:
+                    del rows[rng.choice(list(rows))]
+        order = list(rows.values())
+        if rng.random() < 0.3:
+            rng.shuffle(order)
+        changed[position] = sorted(order, key=lambda row: -row.points)
+    return changed
+
+
+def boards(leaders: list[main.PointLeaders]) -> list[tuple]:
+    return [(board.position, board.descending, scorers(board.players)) for board in leaders]
+
+
+class LiveUpdateTest(unittest.TestCase):
+    def test_updates_match_rebuilding(self) -> None:
+        rng = random.Random(0)
+        reports = random_reports(rng)
+        teams = random_teams(rng, reports)
+        live = main.LivePeriod(main.RD2_LEAGUE, 1, main.DEFAULT_HTML_PARSER)
+        table = main.StatsTable(reports)
+        table.assign_teams(teams)
+        live.leaders = main.parse_point_leaders(table, main.RD2_LEAGUE.all_star_positions)
+
+        for poll in range(300):
+            reports = changed_reports(rng, reports)
+            changed_rows = {
+                position: table.update(position, rows) for position, rows in reports.items()
+            }
+            live.update_leaders(table, changed_rows)
+            if rng.random() < 0.2:
+                teams = random_teams(rng, reports)
+                table.assign_teams(teams)
+                live.move_leaders(table)
+
+            rebuilt = main.StatsTable(reports)
+            rebuilt.assign_teams(teams)
+            with self.subTest(poll=poll):
+                self.assertEqual(
+                    boards(live.leaders),
+                    boards(main.parse_point_leaders(rebuilt, main.RD2_LEAGUE.all_star_positions)),
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()